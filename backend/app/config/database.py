@@ -6,31 +6,74 @@
 - 提供数据库会话管理
 - 提供依赖注入函数供路由使用
 
+性能设置：
+- 每个新建的底层连接都会执行一次 PRAGMA：WAL 日志、synchronous=NORMAL、64MB 页缓存、
+  临时表走内存、256MB mmap、开启外键约束；读请求与写请求因此可以并发执行。
+- 使用 AsyncAdaptedQueuePool 复用长连接，PRAGMA 只在建连时执行一次，页缓存保持热状态。
+- 关闭驱动层的隐式事务（isolation_level=None），由 SQLAlchemy 在事务开始时显式发出 BEGIN；
+  多行 INSERT 通过 insertmanyvalues 合并为单条语句。
+
 使用：
 - 在路由中通过 Depends(get_db) 获取数据库会话
 """
 
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from pathlib import Path
 
 # 数据库路径：与现有 sql_app.db 同目录
 DATABASE_URL = "sqlite+aiosqlite:///./backend/sql_app.db"
 
+# 新连接建立时执行的 PRAGMA（连接生命周期内有效）
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-64000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA foreign_keys=ON",
+)
+
 # 创建异步引擎
 engine = create_async_engine(
     DATABASE_URL, 
     echo=False,  # 生产环境设为 False
-    future=True
+    future=True,
+    poolclass=AsyncAdaptedQueuePool,
+    # SQLite 同一时刻只有一个写者，连接数再大也无法提升写吞吐；10+20 足以覆盖并发读
+    pool_size=10,
+    max_overflow=20,
+    pool_timeout=30,  # 连接耗尽时最多排队 30 秒，而不是无限期挂起请求
+    pool_pre_ping=True,
+    pool_recycle=3600,
+    insertmanyvalues_page_size=1000,
+    connect_args={"check_same_thread": False, "isolation_level": None},
 )
 
+
+@event.listens_for(engine.sync_engine, "connect")
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """为每个新建的 SQLite 连接设置性能相关 PRAGMA。"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+@event.listens_for(engine.sync_engine, "begin")
+def _do_begin(conn):
+    """驱动处于 autocommit 模式，事务边界由这里显式开启。"""
+    conn.exec_driver_sql("BEGIN")
+
+
 # 创建异步会话工厂
-AsyncSessionLocal = sessionmaker(
-    engine, 
-    class_=AsyncSession, 
+AsyncSessionLocal = async_sessionmaker(
+    engine,
     expire_on_commit=False,
     autoflush=False,
-    autocommit=False
 )
 
 
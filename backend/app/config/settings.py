@@ -2,10 +2,12 @@
 后端基础配置（含 SAM 与豆包多模态 + .env 自动加载）
 ---------------------------------
 功能：
-- 定义上传目录（physics/math）并在模块加载时确保目录存在。
+- 定义上传目录（physics/math），由 `ensure_upload_dirs()` 在应用启动时创建。
 - 定义允许的前端跨域源（默认 vite 开发地址）。
 - 定义 Segment Anything 模型配置：模型类型与 checkpoint 路径、设备。
 - 定义豆包（Doubao Ark）多模态调用配置：`ARK_BASE_URL`、`ARK_API_KEY`、`DOUBAO_MODEL_ID`。
+- 环境相关配置集中在 pydantic-settings 的 `Settings` 中，通过 `get_settings()` 获取（进程内只解析一次）；
+  `.env` 由本模块预先加载进环境变量，`Settings` 直接读取环境变量。
 
 本次修改（同步权重新位置）：
 - 默认的 `SAM_CHECKPOINT_PATH` 从 `backend/app/models/sam_vit_l_0b3195.pth` 更新为
@@ -16,77 +18,208 @@
 - 请在部署环境中设置环境变量 `ARK_API_KEY`（来自豆包方舟平台），也可通过 `.env` 注入；
 - 如需更换模型或地域端点，可设置 `DOUBAO_MODEL_ID` 与 `ARK_BASE_URL`；
 - 若权重文件不在默认位置，可设置 `SAM_CHECKPOINT_PATH` 指向实际文件。
-- 其余配置项可根据机器情况切换到 GPU（`SAM_DEVICE=cuda`）。
+- SAM 默认在检测到 CUDA 时使用 GPU（`SAM_DEVICE=auto`），也可显式设为 `cpu` / `cuda`。
 
 后续扩展：
-- 可迁移到 pydantic-settings 进行更健壮的配置管理；
 - 统一维护端口、日志等级、数据库等。
 """
 
+from functools import cache, cached_property, lru_cache
 from pathlib import Path
+import hashlib
+import json
 import os
-from dotenv import find_dotenv, load_dotenv
+import re
+from dotenv import dotenv_values, find_dotenv
+from pydantic import field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
-# 注意：settings.py 位于 project_root/backend/app/config/
-# 因此项目根目录应为 `parents[3]`
-PROJECT_ROOT = Path(__file__).resolve().parents[3]
+@cache
+def _project_root() -> Path:
+    """项目根目录（进程内只计算一次）。
+
+    settings.py 位于 project_root/backend/app/config/，因此根目录为 `parents[3]`；
+    仅当本文件是符号链接时才做 `resolve()`，其余情况只做纯字符串的绝对路径换算。
+    """
+    here = Path(os.path.abspath(__file__))
+    if here.is_symlink():
+        here = here.resolve()
+    return here.parents[3]
+
+
+PROJECT_ROOT = _project_root()
 BACKEND_DIR = PROJECT_ROOT / "backend"
 UPLOAD_DIR = BACKEND_DIR / "uploads"
 
+
+def _env_cache_file() -> Path:
+    """`.env` 查找结果缓存文件：位于当前用户的缓存目录（不用共享的系统临时目录），按项目根目录与当前工作目录区分。"""
+    key = hashlib.md5(f"{PROJECT_ROOT}|{os.getcwd()}".encode("utf-8")).hexdigest()[:16]
+    base = Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "mhm-envcache" / f"{key}.json"
+
+
+def _read_cached_env_path(cache_file: Path) -> Path | None:
+    """读取缓存的 `.env` 路径；缓存不属于当前用户、`.env` 已不存在或已被修改时返回 None。"""
+    try:
+        if hasattr(os, "getuid") and cache_file.stat().st_uid != os.getuid():
+            return None
+        cached = json.loads(cache_file.read_text(encoding="utf-8"))
+        env_path = Path(cached["path"])
+        if env_path.stat().st_mtime_ns != cached["mtime_ns"]:
+            return None
+        return env_path
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _write_cached_env_path(cache_file: Path, env_path: Path) -> None:
+    """只缓存 `.env` 的路径与 mtime（不含任何取值），文件权限 0600；写入失败忽略。"""
+    try:
+        cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"path": str(env_path), "mtime_ns": env_path.stat().st_mtime_ns}, f)
+        os.replace(tmp, cache_file)
+    except OSError:
+        pass
+
+
+def _apply_env(values: dict) -> None:
+    # 与 `load_dotenv(override=False)` 一致：已存在的环境变量不被覆盖
+    for k, v in values.items():
+        if v is not None:
+            os.environ.setdefault(k, v)
+
+
+def _load_env() -> None:
+    """加载 `.env` 到环境变量，并缓存查找到的路径。
+
+    - 设置 `DOTENV_PATH` 时直接使用该文件，跳过向上逐级查找；
+    - 否则优先使用缓存的路径（`.env` 未修改时），省去逐级查找；`.env` 本身很小，每次直接解析；
+    - 缓存中不保存任何配置值（含密钥），缓存读写失败时回退为直接查找，不影响启动。
+    """
+    explicit = os.getenv("DOTENV_PATH")
+    if explicit:
+        env_path = Path(explicit)
+    else:
+        cache_file = _env_cache_file()
+        env_path = _read_cached_env_path(cache_file)
+        if env_path is None:
+            found = find_dotenv(filename=".env", usecwd=True)
+            env_path = Path(found) if found else PROJECT_ROOT / ".env"
+            if env_path.is_file():
+                _write_cached_env_path(cache_file, env_path)
+    if not env_path.is_file():
+        return
+
+    _apply_env({k: v for k, v in dotenv_values(env_path).items() if v is not None})
+
+
 # 自动加载项目根目录 .env（若存在）。
-# 注意：`override=False`，即环境变量已存在时不被 .env 覆盖，方便在生产环境直接通过系统环境变量注入。
-_found = find_dotenv(filename=".env", usecwd=True)
-if _found:
-    load_dotenv(_found, override=False)
-else:
-    load_dotenv(str(PROJECT_ROOT / ".env"), override=False)
+# 注意：已存在的环境变量不被 .env 覆盖，方便在生产环境直接通过系统环境变量注入。
+_load_env()
 
 PHYSICS_UPLOAD_DIR = UPLOAD_DIR / "physics"
 MATH_UPLOAD_DIR = UPLOAD_DIR / "math"
+# SAM 图像 embedding 磁盘缓存（按图片内容 sha256 命名）；属内部产物，
+# 放在 UPLOAD_DIR 之外，避免经 /uploads 静态路由被公开下载
+EMBEDDING_CACHE_DIR = BACKEND_DIR / "cache" / "embeddings"
+# /simulate 产出的精灵图与清理后背景（按源图与轮廓摘要命名，经 /uploads 静态路由提供）
+SPRITE_DIR = PHYSICS_UPLOAD_DIR / "sprites"
+INPAINTED_DIR = PHYSICS_UPLOAD_DIR / "inpainted"
+
+
+
+def _ensure_dir(path: Path) -> None:
+    """确保目录存在；目录已存在时一次 mkdir 即返回，不逐级检查父目录。"""
+    try:
+        os.makedirs(path)
+    except FileExistsError:
+        pass
+
+
+def ensure_upload_dirs() -> None:
+    """创建上传目录与 embedding 缓存目录。由应用启动（lifespan）调用一次，导入本模块不产生文件系统副作用。"""
+    for d in (PHYSICS_UPLOAD_DIR, MATH_UPLOAD_DIR, EMBEDDING_CACHE_DIR, SPRITE_DIR, INPAINTED_DIR):
+        _ensure_dir(d)
+
+class Settings(BaseSettings):
+    """环境相关配置（由环境变量 / `.env` 注入，字段名对应大写环境变量名）。
+
+    通过 `get_settings()` 获取进程级单例；实例冻结，禁止运行时修改。
+    """
+
+    model_config = SettingsConfigDict(frozen=True, extra="ignore")
+
+    # --- 跨域配置 ---
+    # 允许跨域的前端地址；`FRONTEND_ORIGINS`（逗号分隔）优先级高于 `FRONTEND_ORIGIN`
+    frontend_origin: str = "http://localhost:5174"
+    frontend_origins: str = ""
+
+    # --- Segment Anything 配置 ---
+    # 模型类型可选："vit_b"、"vit_l"、"vit_h"（对应官方权重）；"vit_t" 为 MobileSAM（需安装 mobile_sam，权重 mobile_sam.pt）
+    sam_model_type: str = "vit_b"
+    # 模型权重文件路径：
+    # - 默认指向 `backend/app/checkpoints/sam_vit_b_01ec64.pth`（与数据模型分离，便于归档管理）。
+    # - 可通过环境变量 `SAM_CHECKPOINT_PATH` 覆盖为任意绝对/相对路径。
+    # - 该值被 `segment_service.init_sam` 在启动时读取并校验存在性（相对路径按当前工作目录解析，无需 resolve）。
+    sam_checkpoint_path: Path = BACKEND_DIR / "app" / "checkpoints" / "sam_vit_b_01ec64.pth"
+    # 可选：由 `backend/export_sam_encoder.py` 导出的图像编码器 ONNX 文件；设置且已安装 onnxruntime 时，
+    # 图像 embedding 改由 ONNX Runtime（TensorRT / CUDA / CPU 提供程序）计算
+    sam_encoder_onnx_path: str = ""
+    # 是否用 torch.compile 编译图像编码器与掩码解码器（启动时预热，GPU 上收益明显；启动耗时增加）
+    sam_compile: bool = False
+    # 设备："auto"（有 CUDA 时用 GPU，否则 CPU）、"cuda" 或 "cpu"；GPU 上推理使用 FP16 autocast
+    sam_device: str = "auto"
+
+    # --- Doubao Ark 配置 ---
+    # 端点与模型：默认使用北京地域与用户提供的示例模型 ID，可通过环境变量覆盖
+    ark_base_url: str = "https://ark.cn-beijing.volces.com/api/v3"
+    # 从环境变量或 .env 中读取豆包 API Key，不要在代码中硬编码真实密钥。
+    ark_api_key: str = ""
+    doubao_model_id: str = "doubao-seed-1-6-flash-250828"
+
+    # --- OpenCV 配置 ---
+    # 每个进程的 OpenCV 线程数；0 表示自动：CPU 核数按 worker 数均分（避免多 worker 时线程超订）
+    opencv_threads: int = 0
+    # Uvicorn worker 数（与 `uvicorn --workers` 共用 `WEB_CONCURRENCY` 环境变量），仅用于上面的自动计算
+    web_concurrency: int = 1
+
+    # --- 缓存配置 ---
+    # Redis 连接地址（如 redis://localhost:6379/0）；为空时使用进程内缓存
+    redis_url: str = ""
+
+    # --- JWT 认证配置 ---
+    # JWT 密钥：用于签名和验证 Token，生产环境必须修改为强密钥
+    jwt_secret_key: str = "your-secret-key-please-change-in-production"
+    # JWT 算法
+    jwt_algorithm: str = "HS256"
+    # Token 过期时间（分钟），默认 7 天
+    jwt_expire_minutes: int = 60 * 24 * 7
+
+    @field_validator("sam_checkpoint_path")
+    @classmethod
+    def _expand_checkpoint(cls, v: Path) -> Path:
+        return v.expanduser()
+
+    @cached_property
+    def cors_origins(self) -> list[str]:
+        """解析后的跨域来源列表（只解析一次）。"""
+        csv = self.frontend_origins.strip()
+        if csv:
+            return [o.strip() for o in csv.split(",") if o.strip()]
+        return [self.frontend_origin, "http://localhost:5175"]
+
+    @cached_property
+    def cors_origin_regex(self) -> str:
+        """由跨域来源列表生成的精确匹配正则，供 CORSMiddleware 的 `allow_origin_regex` 使用。"""
+        return "^(" + "|".join(re.escape(o) for o in self.cors_origins) + ")$"
+
 
-# 确保目录存在
-PHYSICS_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-MATH_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-
-# 允许跨域的前端地址
-_origins_csv = os.getenv("FRONTEND_ORIGINS", "").strip()
-if _origins_csv:
-    FRONTEND_ORIGINS = [o.strip() for o in _origins_csv.split(",") if o.strip()]
-else:
-    FRONTEND_ORIGINS = [
-        os.getenv("FRONTEND_ORIGIN", "http://localhost:5174"),
-        "http://localhost:5175",
-    ]
-
-# --- Segment Anything 配置 ---
-# 模型类型可选："vit_b"、"vit_l"、"vit_h"（对应官方权重）
-SAM_MODEL_TYPE = os.getenv("SAM_MODEL_TYPE", "vit_b")
-# 模型权重文件路径：
-# - 默认指向 `backend/app/checkpoints/sam_vit_l_0b3195.pth`（与数据模型分离，便于归档管理）。
-# - 可通过环境变量 `SAM_CHECKPOINT_PATH` 覆盖为任意绝对/相对路径。
-# - 该值被 `segment_service.init_sam` 在启动时读取并校验存在性。
-SAM_CHECKPOINT_PATH = Path(
-    os.getenv(
-        "SAM_CHECKPOINT_PATH",
-        BACKEND_DIR / "app" / "checkpoints" / "sam_vit_b_01ec64.pth",
-    )
-).expanduser().resolve()
-
-# 设备与性能设置
-SAM_DEVICE = os.getenv("SAM_DEVICE", "cpu")  # 可设为 "cuda"（若有 GPU）
-
-# --- Doubao Ark 配置 ---
-# 端点与模型：默认使用北京地域与用户提供的示例模型 ID，可通过环境变量覆盖
-ARK_BASE_URL = os.getenv("ARK_BASE_URL", "https://ark.cn-beijing.volces.com/api/v3")
-# 从环境变量或 .env 中读取豆包 API Key，不要在代码中硬编码真实密钥。
-ARK_API_KEY = os.getenv("ARK_API_KEY", "")
-DOUBAO_MODEL_ID = os.getenv("DOUBAO_MODEL_ID", "doubao-seed-1-6-flash-250828")
-
-# --- JWT 认证配置 ---
-# JWT 密钥：用于签名和验证 Token，生产环境必须修改为强密钥
-JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-please-change-in-production")
-# JWT 算法
-JWT_ALGORITHM = "HS256"
-# Token 过期时间（分钟），默认 7 天
-JWT_EXPIRE_MINUTES = int(os.getenv("JWT_EXPIRE_MINUTES", 60 * 24 * 7))
+@lru_cache
+def get_settings() -> Settings:
+    """返回进程级配置单例（环境变量只解析一次）。"""
+    return Settings()
@@ -5,6 +5,7 @@
 - 创建 FastAPI 应用并配置 CORS，允许前端开发环境跨域访问。
 - 暴露健康检查接口 `/healthz`，便于前端/测试验证服务可用。
 - 挂载物理模拟与数学讲解两个路由模块，路径分别为 `/physics` 与 `/math`。
+- 通过 `lifespan` 在启动时创建上传目录、于线程池中加载 SAM 模型，并预建数据库连接；关闭时释放数据库与豆包客户端连接池。
 
 后续扩展：
 - 若需要增加统一前缀（例如 `/api`），可在 include_router 时增加 `prefix="/api/physics"` 等。
@@ -12,8 +13,13 @@
 - 部署到生产时建议使用 `gunicorn`/`uvicorn` 结合反向代理（如 Nginx），并在 `settings.py` 中维护配置项。
 """
 
+from contextlib import asynccontextmanager
+import asyncio
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 import os
 
@@ -21,18 +27,64 @@ from .routers.physics_router import router as physics_router
 from .routers.auth_router import router as auth_router
 from .routers.animation_router import router as animation_router
 from .services.segment_service import init_sam
-from .config.settings import FRONTEND_ORIGINS, UPLOAD_DIR
+from .config.database import engine
+from .services.cache_service import init_cache, close_cache
+from .services.multimodal_service import close_client as close_ark_client
+from .utils.logger import log
+from .config.settings import UPLOAD_DIR, ensure_upload_dirs, get_settings
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """上传文件以 `<uuid>_<原名>` 命名、精灵/背景以输入摘要命名，写入后都不再修改，因此可让浏览器长期缓存。"""
+
+    async def get_response(self, path: str, scope):
+        response = await super().get_response(path, scope)
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """应用生命周期：启动时创建上传目录、在线程池加载 SAM 模型，同时预建数据库连接并初始化缓存。"""
 
+    async def _warm_db():
+        try:
+            async with engine.begin():
+                pass
+        except Exception as e:
+            # 预热失败不阻止启动，首个请求时会重新建连并暴露具体错误
+            log.error(f"数据库连接预热失败: {e}")
 
-app = FastAPI(title="Physics & Math API", version="0.2.0")
+    ensure_upload_dirs()
+    # SAM 权重加载为阻塞 I/O + CPU，放到线程中与数据库预热并行，不阻塞事件循环
+    await asyncio.gather(asyncio.to_thread(init_sam), _warm_db(), init_cache())
+    yield
+    await close_cache()
+    await close_ark_client()
+    await engine.dispose()
+
+
+# 默认使用 orjson 序列化响应（scene_data 等大 JSON 编码更快）
+app = FastAPI(
+    title="Physics & Math API",
+    version="0.2.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
+
+# 压缩较大的 JSON 响应（scene_data 等）；需先于 CORS 注册，使 CORS 位于外层
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
 
 # 允许前端开发端口跨域访问（默认 vite 5174）
+# 显式列出前端实际使用的方法与请求头，预检请求无需回显任意值；来源使用预编译正则匹配
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=FRONTEND_ORIGINS,
+    allow_origins=[],
+    allow_origin_regex=get_settings().cors_origin_regex,
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+    allow_headers=["authorization", "content-type"],
 )
 
 
@@ -43,7 +95,12 @@ async def healthz():
 
 
 # 挂载静态文件目录（用于提供上传的图片）
-app.mount("/uploads", StaticFiles(directory=str(UPLOAD_DIR)), name="uploads")
+# 生产环境建议由 Nginx 直接提供 /uploads（sendfile），此处仅作开发与兜底
+app.mount(
+    "/uploads",
+    ImmutableStaticFiles(directory=str(UPLOAD_DIR), html=False, check_dir=False),
+    name="uploads",
+)
 
 # 路由挂载（可根据需要调整 prefix）
 app.include_router(physics_router, prefix="/physics", tags=["physics"])
@@ -57,8 +114,3 @@ if _enable_math:
     except Exception:
         pass
 
-
-@app.on_event("startup")
-async def _load_models():
-    """应用启动时加载 SAM 模型，提升首次分割请求的速度。"""
-    init_sam()
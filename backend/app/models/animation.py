@@ -4,51 +4,99 @@
 功能：
 - 定义 Animation 表结构，用于存储用户保存的动画
 - 定义 AnimationLike 表结构，用于存储点赞记录
+- scene_data 以压缩二进制存储（见 `types.CompressedJSON`），含 base64 预览图的大对象可显著减少磁盘与缓存占用
 
 使用：
 - 用于保存、加载、分享动画
 - 支持点赞、发布到广场等社区功能
 """
 
-from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, JSON
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Integer, String, Text, Boolean, DateTime, ForeignKey, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime
 from .base import Base
+from .types import CompressedJSON
 
 
 class Animation(Base):
     """动画模型"""
     __tablename__ = "animations"
+    __table_args__ = (
+        # 我的动画：WHERE user_id = ? ORDER BY created_at DESC
+        Index("ix_animations_user_created", "user_id", "created_at"),
+    )
+    # 插入/更新后通过 RETURNING 取回数据库生成的时间戳，避免访问时再次查询
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(Integer, primary_key=True, index=True, comment="动画ID")
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True, comment="创建者ID")
-    title = Column(String(100), nullable=False, comment="动画名称")
-    description = Column(Text, nullable=True, comment="动画描述")
-    thumbnail_url = Column(Text, nullable=True, comment="封面图URL（data URL或相对路径）")
-    scene_data = Column(JSON, nullable=False, comment="场景数据（JSON格式）")
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, comment="动画ID")
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True, comment="创建者ID")
+    title: Mapped[str] = mapped_column(String(100), nullable=False, comment="动画名称")
+    description: Mapped[Optional[str]] = mapped_column(Text, nullable=True, comment="动画描述")
+    thumbnail_url: Mapped[Optional[str]] = mapped_column(Text, nullable=True, comment="封面图URL（data URL或相对路径）")
+    scene_data: Mapped[Dict[str, Any]] = mapped_column(CompressedJSON, nullable=False, comment="场景数据（压缩后的 JSON）")
     
     # 社区功能相关
-    is_public = Column(Boolean, default=False, comment="是否发布到广场")
-    show_author = Column(Boolean, default=True, comment="是否显示作者")
-    like_count = Column(Integer, default=0, comment="点赞数")
-    fork_from = Column(Integer, nullable=True, comment="Fork来源动画ID")
-    share_code = Column(String(10), unique=True, nullable=True, index=True, comment="分享链接code")
+    is_public: Mapped[Optional[bool]] = mapped_column(Boolean, default=False, comment="是否发布到广场")
+    show_author: Mapped[Optional[bool]] = mapped_column(Boolean, default=True, comment="是否显示作者")
+    like_count: Mapped[Optional[int]] = mapped_column(Integer, default=0, comment="点赞数")
+    fork_from: Mapped[Optional[int]] = mapped_column(Integer, nullable=True, comment="Fork来源动画ID")
+    share_code: Mapped[Optional[str]] = mapped_column(String(10), unique=True, nullable=True, index=True, comment="分享链接code")
     
-    # 时间戳
-    created_at = Column(DateTime, default=datetime.utcnow, comment="创建时间")
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, comment="更新时间")
+    # 时间戳（由 SQLite 生成 UTC 时间，不在 Python 侧计算）。
+    # default 为 SQL 表达式，直接内联进 INSERT：旧库的时间戳列没有 DEFAULT 也能写入；server_default 供新建的表使用
+    created_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, default=func.current_timestamp(), server_default=func.current_timestamp(), comment="创建时间"
+    )
+    updated_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime,
+        default=func.current_timestamp(),
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp(),
+        comment="更新时间",
+    )
     
     def __repr__(self):
         return f"<Animation(id={self.id}, title={self.title}, user_id={self.user_id})>"
 
 
+# 广场列表：WHERE is_public IS 1 ORDER BY like_count DESC, created_at DESC, id DESC
+# 部分索引只包含公开动画，体积小；列顺序与排序（含 keyset 分页的 id）一致，查询无需额外排序
+Index(
+    "ix_animations_plaza_rank",
+    Animation.like_count.desc(),
+    Animation.created_at.desc(),
+    Animation.id.desc(),
+    sqlite_where=Animation.is_public.is_(True),
+)
+
+
+# 列表页所需的列：只查询这些列即可跳过 scene_data（大字段）的读取与解压
+Animation.list_columns = (
+    Animation.id,
+    Animation.title,
+    Animation.thumbnail_url,
+    Animation.like_count,
+    Animation.created_at,
+)
+
+
 class AnimationLike(Base):
     """动画点赞记录"""
     __tablename__ = "animation_likes"
+    __table_args__ = (
+        # 每个用户对同一动画只能点赞一次（数据库层面保证）
+        Index("ix_animation_likes_user_animation", "user_id", "animation_id", unique=True),
+    )
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(Integer, primary_key=True, index=True, comment="记录ID")
-    animation_id = Column(Integer, ForeignKey("animations.id", ondelete="CASCADE"), nullable=False, index=True, comment="动画ID")
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True, comment="点赞用户ID")
-    created_at = Column(DateTime, default=datetime.utcnow, comment="点赞时间")
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, comment="记录ID")
+    animation_id: Mapped[int] = mapped_column(Integer, ForeignKey("animations.id", ondelete="CASCADE"), nullable=False, index=True, comment="动画ID")
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False, index=True, comment="点赞用户ID")
+    created_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, default=func.current_timestamp(), server_default=func.current_timestamp(), comment="点赞时间"
+    )
     
     def __repr__(self):
         return f"<AnimationLike(animation_id={self.animation_id}, user_id={self.user_id})>"
@@ -8,10 +8,13 @@
 使用：
 - AnimationCreateRequest: 创建动画的请求体
 - AnimationResponse: 动画信息的响应
+- LikeStatusBatchRequest: 批量查询点赞状态的请求体
+- AnimationListItemList / MyAnimationListItemList / PlazaAnimationListItemList:
+  列表序列化用的 TypeAdapter，一次调用完成整批校验与输出（在 pydantic-core 中循环）
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 
@@ -22,8 +25,8 @@ class AnimationCreateRequest(BaseModel):
     thumbnail_url: Optional[str] = Field(None, description="封面图URL（data URL）")
     scene_data: Dict[str, Any] = Field(..., description="场景数据（JSON）")
     
-    class Config:
-        json_schema_extra = {
+    model_config = ConfigDict(
+        json_schema_extra={
             "example": {
                 "title": "弹性碰撞演示",
                 "description": "展示两个小球的弹性碰撞过程",
@@ -36,6 +39,7 @@ class AnimationCreateRequest(BaseModel):
                 }
             }
         }
+    )
 
 
 class AnimationUpdateRequest(BaseModel):
@@ -46,6 +50,11 @@ class AnimationUpdateRequest(BaseModel):
     scene_data: Optional[Dict[str, Any]] = None
 
 
+class LikeStatusBatchRequest(BaseModel):
+    """批量查询点赞状态请求"""
+    animation_ids: List[int] = Field(..., max_length=200, description="动画ID列表")
+
+
 class AnimationResponse(BaseModel):
     """动画响应"""
     id: int
@@ -57,8 +66,7 @@ class AnimationResponse(BaseModel):
     like_count: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore", frozen=True)
 
 
 class AnimationDetailResponse(BaseModel):
@@ -73,8 +81,7 @@ class AnimationDetailResponse(BaseModel):
     like_count: int
     created_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore", frozen=True)
 
 
 class AnimationListItem(BaseModel):
@@ -83,8 +90,21 @@ class AnimationListItem(BaseModel):
     title: str
     thumbnail_url: Optional[str]
     like_count: int
-    created_at: str  # ISO格式字符串
+    created_at: datetime  # 输出时序列化为 ISO 格式字符串
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore", frozen=True)
+
+
+class MyAnimationListItem(AnimationListItem):
+    """我的动画列表项"""
+    is_public: Optional[bool] = None
+
+
+class PlazaAnimationListItem(AnimationListItem):
+    """广场动画列表项（作者未公开时不输出 author_name）"""
+    author_name: Optional[str] = None
+
 
+AnimationListItemList = TypeAdapter(List[AnimationListItem])
+MyAnimationListItemList = TypeAdapter(List[MyAnimationListItem])
+PlazaAnimationListItemList = TypeAdapter(List[PlazaAnimationListItem])
@@ -10,11 +10,13 @@ from .base import Base
 
 class MyModel(Base):
     __tablename__ = "my_table"
+    id: Mapped[int] = mapped_column(primary_key=True)
     ...
 """
 
-from sqlalchemy.orm import declarative_base
+from sqlalchemy.orm import DeclarativeBase
 
-# 创建统一的 Base
-Base = declarative_base()
+
+class Base(DeclarativeBase):
+    """统一的声明式基类（SQLAlchemy 2.0 风格，支持 `Mapped` 类型注解）。"""
 
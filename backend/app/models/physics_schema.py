@@ -58,7 +58,7 @@ class PhysicsElement(BaseModel):
     parameters: PhysicsParameters = Field(default_factory=PhysicsParameters, description="物理参数")
     constraints: Optional[ElementConstraint] = Field(None, description="约束关系")
     contour: List[Point] = Field(default_factory=list, description="轮廓坐标")
-    sprite_data_url: Optional[str] = Field(None, description="精灵图 data URL")
+    sprite_data_url: Optional[str] = Field(None, description="精灵图地址（/uploads 静态资源 URL 或 data URL）")
 
 
 class PhysicsSegmentRequest(BaseModel):
@@ -68,12 +68,16 @@ class PhysicsSegmentRequest(BaseModel):
     - image_size: [height, width]（备用字段）。
     - points: 用户点击转换的点提示集合。
     - box: 框选提示，格式 [x1, y1, x2, y2]。
+    - point_batches: 多组点提示（每组对应一个物体），一次解码器调用批量分割，响应返回 `contours`。
+    - binary: 为 true 时成功响应为 `application/octet-stream` 的原始 int32 坐标，而非 JSON 点列表。
     """
 
     image_path: Optional[str] = None
     image_size: Optional[List[int]] = None  # [h, w]
     points: List[Point] = []
     box: Optional[List[int]] = None
+    point_batches: Optional[List[List[Point]]] = None
+    binary: bool = False
 
 
 class PhysicsSimulateRequest(BaseModel):
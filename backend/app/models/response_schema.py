@@ -4,13 +4,20 @@
 功能：
 - 定义后端接口统一返回结构：code、message、data。
 - 提供便捷的 `ok` 与 `error` 工厂方法，便于路由快速构建返回体。
+- `ok_response`：直接构造 ORJSONResponse，跳过 response_model 的校验与二次序列化，
+  用于返回体很大的接口（含 scene_data 的详情、广场列表、物理模拟接口）。
+- `public_ok_response`：在 `ok_response` 基础上附加 `Cache-Control` 与基于响应体的 `ETag`，
+  请求携带匹配的 `If-None-Match` 时返回 304，供公开只读接口使用（浏览器/CDN 可复用缓存）。
 
 后续扩展：
 - 可根据需要增加 `request_id`、`trace_id` 等字段，便于链路追踪。
 - 若需要更复杂的泛型类型，可迁移到 Pydantic v2 的 `typing.Annotated` 或自定义泛型模型。
 """
 
+import hashlib
 from typing import Any, Optional
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 
 
@@ -25,4 +32,35 @@ class ApiResponse(BaseModel):
 
     @classmethod
     def error(cls, message: str = "error", code: int = 1, data: Any | None = None) -> "ApiResponse":
-        return cls(code=code, message=message, data=data)
\ No newline at end of file
+        return cls(code=code, message=message, data=data)
+
+
+def ok_response(data: Any | None = None, message: str = "success") -> ORJSONResponse:
+    """与 `ApiResponse.ok` 结构相同，但由 orjson 一次性编码；`data` 需为 JSON 兼容对象。"""
+    return ORJSONResponse({"code": 0, "message": message, "data": data})
+
+
+def public_ok_response(
+    request: Request,
+    data: Any | None = None,
+    message: str = "success",
+    max_age: int = 30,
+    private: bool = False,
+) -> Response:
+    """
+    公开只读接口的成功返回：带缓存头，内容未变化时返回 304（不含响应体）。
+    
+    `private=True` 用于包含当前用户个性化字段的响应：只允许浏览器缓存，CDN 不得复用。
+    """
+    response = ok_response(data, message)
+    etag = f'"{hashlib.md5(response.body).hexdigest()}"'
+    headers = {
+        "Cache-Control": f"{'private' if private else 'public'}, max-age={max_age}",
+        "ETag": etag,
+        "Vary": "Authorization",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in {tag.strip() for tag in if_none_match.split(",")}:
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return response
@@ -0,0 +1,62 @@
+"""
+自定义数据库列类型
+---------------------------------
+功能：
+- `CompressedJSON`：将 JSON 对象以 orjson 序列化后压缩为二进制存储，读取时自动解压并反序列化。
+
+说明：
+- 优先使用 zstandard 压缩（level=3）；未安装时回退到标准库 zlib；
+- 读取时按数据头识别压缩格式，并兼容历史遗留的 JSON 文本行（旧版 `JSON` 列写入的数据），无需迁移即可读取。
+"""
+
+from __future__ import annotations
+
+import zlib
+from typing import Any
+
+import orjson
+from sqlalchemy.types import LargeBinary, TypeDecorator
+
+try:
+    import zstandard
+except Exception:  # 可选依赖：缺失时使用 zlib
+    zstandard = None
+
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _compress(raw: bytes) -> bytes:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=3).compress(raw)
+    return zlib.compress(raw, 6)
+
+
+def _decompress(blob: bytes) -> bytes:
+    if blob[:4] == _ZSTD_MAGIC:
+        if zstandard is None:
+            raise RuntimeError("zstandard 未安装，无法解压 scene_data")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    return zlib.decompress(blob)
+
+
+class CompressedJSON(TypeDecorator):
+    """压缩存储的 JSON 列（底层为 BLOB）。"""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> bytes | None:
+        if value is None:
+            return None
+        return _compress(orjson.dumps(value))
+
+    def process_result_value(self, value: Any, dialect) -> Any:
+        if value is None:
+            return None
+        # 旧版 JSON 列存储的是文本
+        if isinstance(value, str):
+            return orjson.loads(value)
+        blob = bytes(value)
+        if blob[:1] in (b"{", b"["):
+            return orjson.loads(blob)
+        return orjson.loads(_decompress(blob))
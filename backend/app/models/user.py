@@ -10,7 +10,10 @@
 - 手机号作为唯一标识
 """
 
-from sqlalchemy import Column, Integer, String, DateTime
+from typing import Optional
+
+from sqlalchemy import Integer, String, DateTime, func
+from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime
 from .base import Base
 
@@ -18,12 +21,16 @@ from .base import Base
 class User(Base):
     """用户模型"""
     __tablename__ = "users"
+    __mapper_args__ = {"eager_defaults": True}
     
-    id = Column(Integer, primary_key=True, index=True, comment="用户ID")
-    phone_number = Column(String(11), unique=True, index=True, nullable=False, comment="手机号")
-    hashed_password = Column(String(255), nullable=False, comment="密码哈希")
-    created_at = Column(DateTime, default=datetime.utcnow, comment="创建时间")
-    last_login = Column(DateTime, nullable=True, comment="最后登录时间")
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True, comment="用户ID")
+    phone_number: Mapped[str] = mapped_column(String(11), unique=True, index=True, nullable=False, comment="手机号")
+    hashed_password: Mapped[str] = mapped_column(String(255), nullable=False, comment="密码哈希")
+    # default 为 SQL 表达式，内联进 INSERT（旧库的列没有 DEFAULT）；server_default 供新建的表使用
+    created_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime, default=func.current_timestamp(), server_default=func.current_timestamp(), comment="创建时间"
+    )
+    last_login: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, comment="最后登录时间")
     
     def __repr__(self):
         return f"<User(id={self.id}, phone={self.phone_number})>"
@@ -7,6 +7,7 @@
 - GET /api/animations/{id} - 获取动画详情
 - DELETE /api/animations/{id} - 删除动画
 - POST /api/animations/{id}/publish - 发布到广场
+- POST /api/plaza/animations/like-status - 批量查询点赞状态
 - POST /api/plaza/animations/{id}/fork - Fork动画
 - POST /api/animations/{id}/share-link - 生成分享链接
 
@@ -14,13 +15,18 @@
 - 在 main.py 中通过 app.include_router 挂载
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
-from typing import List
-import random
+from sqlalchemy import String, select, insert, delete, update, exists, func, case, literal, tuple_, type_coerce
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from typing import List, Optional
+import base64
+import secrets
 import string
 
+import orjson
+
 from ..config.database import get_db
 from ..models.user import User
 from ..models.animation import Animation, AnimationLike
@@ -28,15 +34,60 @@ from ..models.animation_schema import (
     AnimationCreateRequest, 
     AnimationResponse,
     AnimationDetailResponse,
-    AnimationListItem
+    AnimationListItem,
+    LikeStatusBatchRequest,
+    MyAnimationListItemList,
+    PlazaAnimationListItemList,
+)
+from ..models.response_schema import ApiResponse, ok_response, public_ok_response
+from ..services.auth_service import get_current_user, get_optional_user_id
+from ..services.cache_service import (
+    PLAZA_LIST_KEY,
+    cache_get,
+    cache_set,
+    invalidate_animation,
+    plaza_detail_key,
+    share_key,
 )
-from ..models.response_schema import ApiResponse
-from ..services.auth_service import get_current_user
 from ..utils.logger import log
+from ..utils.phone_utils import mask_phone_number
 
 
 router = APIRouter()
 
+# 分享码：6 位小写字母+数字（36^6 ≈ 21 亿种），唯一性由 share_code 唯一索引保证
+_SHARE_CODE_ALPHABET = string.ascii_lowercase + string.digits
+_SHARE_CODE_LENGTH = 6
+_SHARE_CODE_MAX_ATTEMPTS = 5
+# 分享页的站内路径前缀；完整链接由前端按当前站点地址拼接，后端不再硬编码 localhost
+_SHARE_PATH_PREFIX = "/physics/play/"
+
+
+def _new_share_code() -> str:
+    return "".join(secrets.choice(_SHARE_CODE_ALPHABET) for _ in range(_SHARE_CODE_LENGTH))
+
+
+# 列表分页：keyset（seek）分页，游标为上一页最后一行的排序键（对客户端不透明）
+_DEFAULT_PAGE_SIZE = 20
+_MAX_PAGE_SIZE = 100
+
+# created_at 以数据库中的原始字符串参与比较，避免 datetime 绑定格式（带微秒）与存储格式不一致
+_created_at_raw = type_coerce(Animation.created_at, String)
+
+
+def _encode_cursor(*values) -> str:
+    return base64.urlsafe_b64encode(orjson.dumps(values)).rstrip(b"=").decode()
+
+
+def _decode_cursor(cursor: str, size: int) -> list:
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="无效的分页游标")
+    return values
+
 
 @router.post("/animations", response_model=ApiResponse)
 async def create_animation(
@@ -92,12 +143,18 @@ async def create_animation(
 
 @router.get("/animations/mine", response_model=ApiResponse)
 async def get_my_animations(
+    limit: Optional[int] = Query(None, ge=1, le=_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """
     获取我的动画列表
     
+    参数：
+    - limit: 可选，每页数量（不传且无 cursor 时返回全部）
+    - cursor: 可选，上一页返回的 next_cursor
+    
     返回：
     - animations: 动画列表数组
       - id: 动画ID
@@ -105,31 +162,40 @@ async def get_my_animations(
       - thumbnail_url: 封面图URL
       - like_count: 点赞数
       - created_at: 创建时间（ISO格式字符串）
+    - next_cursor: 分页时返回，下一页游标（没有更多时为 null）
     """
     try:
+        paginated = limit is not None or cursor is not None
+        
+        # 只查询列表所需列，不加载 scene_data
         stmt = (
-            select(Animation)
+            select(*Animation.list_columns, Animation.is_public, _created_at_raw.label("created_at_raw"))
             .where(Animation.user_id == current_user.id)
-            .order_by(Animation.created_at.desc())
+            .order_by(Animation.created_at.desc(), Animation.id.desc())
         )
+        if paginated:
+            limit = limit or _DEFAULT_PAGE_SIZE
+            if cursor is not None:
+                created_at_raw, last_id = _decode_cursor(cursor, 2)
+                stmt = stmt.where(tuple_(_created_at_raw, Animation.id) < tuple_(created_at_raw, last_id))
+            stmt = stmt.limit(limit + 1)
         
         result = await db.execute(stmt)
-        animations = result.scalars().all()
+        animations = result.all()
         
-        return ApiResponse.ok({
-            "animations": [
-                {
-                    "id": anim.id,
-                    "title": anim.title,
-                    "thumbnail_url": anim.thumbnail_url,
-                    "like_count": anim.like_count,
-                    "is_public": anim.is_public,
-                    "created_at": anim.created_at.isoformat()
-                }
-                for anim in animations
-            ]
-        })
+        data = {}
+        if paginated:
+            has_more = len(animations) > limit
+            animations = animations[:limit]
+            last = animations[-1] if has_more else None
+            data["next_cursor"] = _encode_cursor(last.created_at_raw, last.id) if last else None
         
+        items = MyAnimationListItemList.validate_python(animations, from_attributes=True)
+        data["animations"] = MyAnimationListItemList.dump_python(items, mode="json")
+        return ApiResponse.ok(data)
+        
+    except HTTPException:
+        raise
     except Exception as e:
         log.error(f"获取动画列表失败：{e}")
         raise HTTPException(status_code=500, detail=f"获取失败：{str(e)}")
@@ -166,12 +232,12 @@ async def get_animation_detail(
         if not animation:
             return ApiResponse.error(404, "动画不存在或无权访问")
         
-        return ApiResponse.ok({
+        return ok_response({
             "id": animation.id,
             "title": animation.title,
             "description": animation.description,
             "scene_data": animation.scene_data,
-            "created_at": animation.created_at.isoformat()
+            "created_at": animation.created_at
         })
         
     except HTTPException:
@@ -197,21 +263,21 @@ async def delete_animation(
     - message: 成功消息
     """
     try:
-        # 先查询确认权限
-        stmt = select(Animation).where(
-            Animation.id == animation_id,
-            Animation.user_id == current_user.id
+        # 按归属条件直接删除（无需先加载含 scene_data 的整行）
+        stmt = (
+            delete(Animation)
+            .where(Animation.id == animation_id, Animation.user_id == current_user.id)
+            .returning(Animation.share_code)
         )
         
         result = await db.execute(stmt)
-        animation = result.scalar_one_or_none()
+        animation = result.one_or_none()
         
         if not animation:
             return ApiResponse.error(404, "动画不存在或无权删除")
         
-        # 删除动画
-        await db.delete(animation)
         await db.commit()
+        await invalidate_animation(animation_id, animation.share_code)
         
         log.info(f"用户 {current_user.id} 删除动画：{animation_id}")
         
@@ -245,25 +311,24 @@ async def publish_to_plaza(
     - message: 成功消息
     """
     try:
-        # 查询动画
-        stmt = select(Animation).where(
-            Animation.id == animation_id,
-            Animation.user_id == current_user.id
+        # 单条 UPDATE 完成归属校验与设置公开
+        stmt = (
+            update(Animation)
+            .where(Animation.id == animation_id, Animation.user_id == current_user.id)
+            .values(is_public=True, show_author=show_author)
+            .returning(Animation.title, Animation.share_code)
         )
         
         result = await db.execute(stmt)
-        animation = result.scalar_one_or_none()
+        row = result.one_or_none()
         
-        if not animation:
+        if not row:
             return ApiResponse.error(404, "动画不存在或无权操作")
         
-        # 设置为公开
-        animation.is_public = True
-        animation.show_author = show_author
-        
         await db.commit()
+        await invalidate_animation(animation_id, row.share_code)
         
-        log.info(f"用户 {current_user.id} 发布动画到广场：{animation_id} - {animation.title}")
+        log.info(f"用户 {current_user.id} 发布动画到广场：{animation_id} - {row.title}")
         
         return ApiResponse.ok({
             "message": "已上传到动画广场"
@@ -293,22 +358,22 @@ async def unpublish_from_plaza(
     - message: 成功消息
     """
     try:
-        # 查询动画
-        stmt = select(Animation).where(
-            Animation.id == animation_id,
-            Animation.user_id == current_user.id
+        # 单条 UPDATE 完成归属校验与设置私有
+        stmt = (
+            update(Animation)
+            .where(Animation.id == animation_id, Animation.user_id == current_user.id)
+            .values(is_public=False)
+            .returning(Animation.share_code)
         )
         
         result = await db.execute(stmt)
-        animation = result.scalar_one_or_none()
+        row = result.one_or_none()
         
-        if not animation:
+        if not row:
             return ApiResponse.error(404, "动画不存在或无权操作")
         
-        # 设置为私有
-        animation.is_public = False
-        
         await db.commit()
+        await invalidate_animation(animation_id, row.share_code)
         
         log.info(f"用户 {current_user.id} 从广场下架动画：{animation_id}")
         
@@ -327,6 +392,7 @@ async def unpublish_from_plaza(
 @router.get("/plaza/animations/{animation_id}", response_model=ApiResponse)
 async def get_plaza_animation_detail(
     animation_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -345,17 +411,24 @@ async def get_plaza_animation_detail(
     - created_at: 创建时间
     """
     try:
-        # 查询动画（必须是公开的）
-        stmt = select(Animation).where(
-            Animation.id == animation_id,
-            Animation.is_public == True
+        cache_key = plaza_detail_key(animation_id)
+        cached = await cache_get(cache_key)
+        if cached is not None:
+            return public_ok_response(request, cached)
+        
+        # 查询动画（必须是公开的），LEFT JOIN 一并取出作者手机号
+        stmt = (
+            select(Animation, User.phone_number)
+            .outerjoin(User, Animation.user_id == User.id)
+            .where(Animation.id == animation_id, Animation.is_public.is_(True))
         )
         
         result = await db.execute(stmt)
-        animation = result.scalar_one_or_none()
+        row = result.one_or_none()
         
-        if not animation:
+        if not row:
             return ApiResponse.error(404, "动画不存在或未公开")
+        animation, phone = row
         
         anim_data = {
             "id": animation.id,
@@ -364,19 +437,15 @@ async def get_plaza_animation_detail(
             "scene_data": animation.scene_data,
             "like_count": animation.like_count,
             "share_code": animation.share_code,  # 返回分享码（如果有）
-            "created_at": animation.created_at.isoformat()
+            "created_at": animation.created_at
         }
         
         # 如果作者选择公开用户名
-        if animation.show_author:
-            user_stmt = select(User).where(User.id == animation.user_id)
-            user_result = await db.execute(user_stmt)
-            user = user_result.scalar_one_or_none()
-            if user:
-                phone = user.phone_number
-                anim_data["author_name"] = f"{phone[:3]}****{phone[-4:]}"
+        if animation.show_author and phone:
+            anim_data["author_name"] = mask_phone_number(phone)
         
-        return ApiResponse.ok(anim_data)
+        await cache_set(cache_key, anim_data)
+        return public_ok_response(request, anim_data)
         
     except HTTPException:
         raise
@@ -385,10 +454,38 @@ async def get_plaza_animation_detail(
         raise HTTPException(status_code=500, detail=f"获取失败：{str(e)}")
 
 
+async def _plaza_list_response(request: Request, db: AsyncSession, data: dict, user_id: Optional[int]):
+    """广场列表返回：已登录时一次查询当前用户的点赞记录，为每项附加 liked（不写回共享缓存）。"""
+    if user_id is None:
+        return public_ok_response(request, data)
+    
+    animations = data["animations"]
+    liked_ids = set()
+    if animations:
+        like_stmt = select(AnimationLike.animation_id).where(
+            AnimationLike.user_id == user_id,
+            AnimationLike.animation_id.in_([anim["id"] for anim in animations])
+        )
+        liked_ids = set((await db.scalars(like_stmt)).all())
+    
+    personalized = {**data, "animations": [{**anim, "liked": anim["id"] in liked_ids} for anim in animations]}
+    return public_ok_response(request, personalized, private=True)
+
+
 @router.get("/plaza/animations", response_model=ApiResponse)
-async def get_plaza_animations(db: AsyncSession = Depends(get_db)):
+async def get_plaza_animations(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    user_id: Optional[int] = Depends(get_optional_user_id),
+    db: AsyncSession = Depends(get_db)
+):
     """
-    获取广场动画列表（公开接口，无需登录）
+    获取广场动画列表（公开接口，无需登录；携带 Token 时附带当前用户的点赞状态）
+    
+    参数：
+    - limit: 可选，每页数量（不传且无 cursor 时返回全部）
+    - cursor: 可选，上一页返回的 next_cursor
     
     返回：
     - animations: 动画列表
@@ -398,44 +495,72 @@ async def get_plaza_animations(db: AsyncSession = Depends(get_db)):
       - like_count: 点赞数
       - author_name: 作者用户名（如果 show_author=true）
       - created_at: 创建时间
+      - liked: 当前用户是否已点赞（仅携带 Token 时返回）
+    - next_cursor: 分页时返回，下一页游标（没有更多时为 null）
     """
     try:
+        # 只缓存完整列表（不含个性化字段）；分页请求直接走部分索引 ix_animations_plaza_rank
+        paginated = limit is not None or cursor is not None
+        if not paginated:
+            cached = await cache_get(PLAZA_LIST_KEY)
+            if cached is not None:
+                return await _plaza_list_response(request, db, cached, user_id)
+        
+        # 只查询列表所需列，不加载 scene_data；LEFT JOIN 作者，避免逐条查询用户（N+1）
         stmt = (
-            select(Animation)
-            .where(Animation.is_public == True)
-            .order_by(Animation.like_count.desc(), Animation.created_at.desc())
+            select(
+                *Animation.list_columns,
+                Animation.show_author,
+                User.phone_number,
+                _created_at_raw.label("created_at_raw"),
+            )
+            .outerjoin(User, Animation.user_id == User.id)
+            .where(Animation.is_public.is_(True))
+            .order_by(Animation.like_count.desc(), Animation.created_at.desc(), Animation.id.desc())
         )
+        if paginated:
+            limit = limit or _DEFAULT_PAGE_SIZE
+            if cursor is not None:
+                like_count, created_at_raw, last_id = _decode_cursor(cursor, 3)
+                stmt = stmt.where(
+                    tuple_(Animation.like_count, _created_at_raw, Animation.id)
+                    < tuple_(like_count, created_at_raw, last_id)
+                )
+            stmt = stmt.limit(limit + 1)
         
         result = await db.execute(stmt)
-        animations = result.scalars().all()
+        rows = result.all()
+        
+        next_cursor = None
+        if paginated and len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            next_cursor = _encode_cursor(last.like_count, last.created_at_raw, last.id)
         
-        # 获取作者信息
         animation_list = []
-        for anim in animations:
-            anim_data = {
-                "id": anim.id,
-                "title": anim.title,
-                "thumbnail_url": anim.thumbnail_url,
-                "like_count": anim.like_count,
-                "created_at": anim.created_at.isoformat()
-            }
+        for anim in rows:
+            anim_data = dict(anim._mapping)
+            show_author = anim_data.pop("show_author")
+            phone = anim_data.pop("phone_number")
+            del anim_data["created_at_raw"]
             
-            # 如果作者选择公开用户名，则查询并返回
-            if anim.show_author:
-                user_stmt = select(User).where(User.id == anim.user_id)
-                user_result = await db.execute(user_stmt)
-                user = user_result.scalar_one_or_none()
-                if user:
-                    # 隐藏手机号中间4位
-                    phone = user.phone_number
-                    anim_data["author_name"] = f"{phone[:3]}****{phone[-4:]}"
+            # 如果作者选择公开用户名，则返回（隐藏手机号中间4位）
+            if show_author and phone:
+                anim_data["author_name"] = mask_phone_number(phone)
             
             animation_list.append(anim_data)
         
-        return ApiResponse.ok({
-            "animations": animation_list
-        })
+        # 作者未公开时不输出 author_name（exclude_unset）
+        items = PlazaAnimationListItemList.validate_python(animation_list)
+        data = {"animations": PlazaAnimationListItemList.dump_python(items, mode="json", exclude_unset=True)}
+        if paginated:
+            data["next_cursor"] = next_cursor
+        else:
+            await cache_set(PLAZA_LIST_KEY, data)
+        return await _plaza_list_response(request, db, data, user_id)
         
+    except HTTPException:
+        raise
     except Exception as e:
         log.error(f"获取广场动画列表失败：{e}")
         raise HTTPException(status_code=500, detail=f"获取失败：{str(e)}")
@@ -458,39 +583,47 @@ async def like_animation(
     - like_count: 更新后的点赞数
     """
     try:
-        # 检查动画是否存在且公开
-        anim_stmt = select(Animation).where(
-            Animation.id == animation_id,
-            Animation.is_public == True
+        # 原子自增点赞数（同时校验动画存在且公开），避免并发点赞时的读-改-写丢失
+        anim_stmt = (
+            update(Animation)
+            .where(Animation.id == animation_id, Animation.is_public.is_(True))
+            .values(like_count=func.coalesce(Animation.like_count, 0) + 1)
+            .returning(Animation.like_count, Animation.share_code)
         )
         anim_result = await db.execute(anim_stmt)
-        animation = anim_result.scalar_one_or_none()
+        animation = anim_result.one_or_none()
         
         if not animation:
+            await db.rollback()
             return ApiResponse.error(404, "动画不存在或未公开")
         
-        # 检查是否已点赞
-        like_stmt = select(AnimationLike).where(
-            AnimationLike.animation_id == animation_id,
-            AnimationLike.user_id == current_user.id
+        # 创建点赞记录：INSERT … SELECT … WHERE NOT EXISTS 自身即可去重，不依赖唯一索引
+        # （未重新执行 init_db 的旧库没有该索引）；有索引时 ON CONFLICT 兜底并发重复插入
+        already_liked = (
+            select(AnimationLike.id)
+            .where(AnimationLike.animation_id == animation_id, AnimationLike.user_id == current_user.id)
+            .exists()
+        )
+        like_stmt = (
+            sqlite_insert(AnimationLike)
+            .from_select(
+                [AnimationLike.animation_id, AnimationLike.user_id, AnimationLike.created_at],
+                select(
+                    literal(animation_id),
+                    literal(current_user.id),
+                    func.current_timestamp(),
+                ).where(~already_liked),
+            )
+            .on_conflict_do_nothing()
         )
         like_result = await db.execute(like_stmt)
-        existing_like = like_result.scalar_one_or_none()
         
-        if existing_like:
+        if like_result.rowcount == 0:
+            await db.rollback()
             return ApiResponse.error(400, "已经点赞过了")
         
-        # 创建点赞记录
-        like = AnimationLike(
-            animation_id=animation_id,
-            user_id=current_user.id
-        )
-        db.add(like)
-        
-        # 更新点赞数
-        animation.like_count = (animation.like_count or 0) + 1
-        
         await db.commit()
+        await invalidate_animation(animation_id, animation.share_code)
         
         log.info(f"用户 {current_user.id} 点赞动画 {animation_id}")
         
@@ -524,29 +657,28 @@ async def unlike_animation(
     - like_count: 更新后的点赞数
     """
     try:
-        # 查找点赞记录
-        like_stmt = select(AnimationLike).where(
+        # 直接删除点赞记录，按影响行数判断是否点赞过
+        like_stmt = delete(AnimationLike).where(
             AnimationLike.animation_id == animation_id,
             AnimationLike.user_id == current_user.id
         )
         like_result = await db.execute(like_stmt)
-        like = like_result.scalar_one_or_none()
         
-        if not like:
+        if like_result.rowcount == 0:
             return ApiResponse.error(400, "还没有点赞")
         
-        # 删除点赞记录
-        await db.delete(like)
-        
-        # 更新动画点赞数
-        anim_stmt = select(Animation).where(Animation.id == animation_id)
+        # 原子递减动画点赞数（不小于 0）
+        anim_stmt = (
+            update(Animation)
+            .where(Animation.id == animation_id)
+            .values(like_count=case((Animation.like_count > 0, Animation.like_count - 1), else_=0))
+            .returning(Animation.like_count, Animation.share_code)
+        )
         anim_result = await db.execute(anim_stmt)
-        animation = anim_result.scalar_one_or_none()
-        
-        if animation:
-            animation.like_count = max(0, (animation.like_count or 0) - 1)
+        animation = anim_result.one_or_none()
         
         await db.commit()
+        await invalidate_animation(animation_id, animation.share_code if animation else None)
         
         log.info(f"用户 {current_user.id} 取消点赞动画 {animation_id}")
         
@@ -563,6 +695,40 @@ async def unlike_animation(
         raise HTTPException(status_code=500, detail=f"取消点赞失败：{str(e)}")
 
 
+@router.post("/plaza/animations/like-status", response_model=ApiResponse)
+async def get_like_status_batch(
+    req: LikeStatusBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    批量查询当前用户对多个动画的点赞状态（广场列表一次请求替代逐卡片查询）
+    
+    请求体：
+    - animation_ids: 动画ID列表（最多 200 个）
+    
+    返回：
+    - liked_ids: 其中已点赞的动画ID列表
+    """
+    try:
+        if not req.animation_ids:
+            return ApiResponse.ok({"liked_ids": []})
+        
+        like_stmt = select(AnimationLike.animation_id).where(
+            AnimationLike.user_id == current_user.id,
+            AnimationLike.animation_id.in_(set(req.animation_ids))
+        )
+        liked_ids = (await db.scalars(like_stmt)).all()
+        
+        return ApiResponse.ok({
+            "liked_ids": list(liked_ids)
+        })
+        
+    except Exception as e:
+        log.error(f"批量查询点赞状态失败：{e}")
+        raise HTTPException(status_code=500, detail=f"查询失败：{str(e)}")
+
+
 @router.get("/plaza/animations/{animation_id}/like-status", response_model=ApiResponse)
 async def get_like_status(
     animation_id: int,
@@ -579,15 +745,15 @@ async def get_like_status(
     - liked: 是否已点赞
     """
     try:
-        like_stmt = select(AnimationLike).where(
+        # EXISTS 命中唯一索引即返回，不读取整行
+        like_stmt = select(exists().where(
             AnimationLike.animation_id == animation_id,
             AnimationLike.user_id == current_user.id
-        )
-        like_result = await db.execute(like_stmt)
-        like = like_result.scalar_one_or_none()
+        ))
+        liked = await db.scalar(like_stmt)
         
         return ApiResponse.ok({
-            "liked": like is not None
+            "liked": bool(liked)
         })
         
     except Exception as e:
@@ -612,37 +778,52 @@ async def fork_animation(
     - message: 成功消息
     """
     try:
-        # 查询源动画（必须是公开的）
-        source_stmt = select(Animation).where(
+        # INSERT ... SELECT 在数据库内复制源动画（必须是公开的），
+        # scene_data 以压缩后的原始字节直接复制，不经过 Python 解压/反序列化
+        source_select = select(
+            literal(current_user.id),
+            Animation.title + "（副本）",
+            Animation.description,
+            Animation.thumbnail_url,
+            Animation.scene_data,
+            literal(False),  # Fork 的动画默认私有
+            literal(True),
+            literal(0),
+            Animation.id,
+        ).where(
             Animation.id == animation_id,
-            Animation.is_public == True
+            Animation.is_public.is_(True)
+        )
+        fork_stmt = (
+            insert(Animation)
+            .from_select(
+                [
+                    Animation.user_id,
+                    Animation.title,
+                    Animation.description,
+                    Animation.thumbnail_url,
+                    Animation.scene_data,
+                    Animation.is_public,
+                    Animation.show_author,
+                    Animation.like_count,
+                    Animation.fork_from,
+                ],
+                source_select,
+            )
+            .returning(Animation.id)
         )
-        source_result = await db.execute(source_stmt)
-        source_animation = source_result.scalar_one_or_none()
+        forked_id = await db.scalar(fork_stmt)
         
-        if not source_animation:
+        if forked_id is None:
+            await db.rollback()
             return ApiResponse.error(404, "动画不存在或未公开")
         
-        # 创建副本
-        forked_animation = Animation(
-            user_id=current_user.id,
-            title=f"{source_animation.title}（副本）",
-            description=source_animation.description,
-            thumbnail_url=source_animation.thumbnail_url,
-            scene_data=source_animation.scene_data,
-            is_public=False,  # Fork 的动画默认私有
-            like_count=0,
-            fork_from=source_animation.id
-        )
-        
-        db.add(forked_animation)
         await db.commit()
-        await db.refresh(forked_animation)
         
-        log.info(f"用户 {current_user.id} Fork 动画 {animation_id} -> {forked_animation.id}")
+        log.info(f"用户 {current_user.id} Fork 动画 {animation_id} -> {forked_id}")
         
         return ApiResponse.ok({
-            "id": forked_animation.id,
+            "id": forked_id,
             "message": "已保存到我的动画"
         })
         
@@ -668,45 +849,64 @@ async def generate_share_link(
     
     返回：
     - share_code: 分享码
-    - share_url: 完整分享链接
+    - share_url: 分享页站内路径（`/physics/play/<share_code>`），前端拼接当前站点地址
     """
     try:
-        # 查询动画（必须是自己的）
-        stmt = select(Animation).where(
+        # 查询动画（必须是自己的），只需要分享码，不加载 scene_data
+        stmt = select(Animation.share_code).where(
             Animation.id == animation_id,
             Animation.user_id == current_user.id
         )
         
         result = await db.execute(stmt)
-        animation = result.scalar_one_or_none()
+        animation = result.one_or_none()
         
         if not animation:
             return ApiResponse.error(404, "动画不存在或无权操作")
         
         # 如果已有分享码，直接返回
         if animation.share_code:
-            share_url = f"http://localhost:5174/physics/play/{animation.share_code}"
             return ApiResponse.ok({
                 "share_code": animation.share_code,
-                "share_url": share_url
+                "share_url": _SHARE_PATH_PREFIX + animation.share_code
             })
         
-        # 生成唯一的6位分享码
-        while True:
-            share_code = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
-            # 检查是否重复
-            check_stmt = select(Animation).where(Animation.share_code == share_code)
-            check_result = await db.execute(check_stmt)
-            if not check_result.scalar_one_or_none():
-                break
-        
-        # 保存分享码
-        animation.share_code = share_code
-        await db.commit()
-        
-        share_url = f"http://localhost:5174/physics/play/{share_code}"
-        
-        log.info(f"用户 {current_user.id} 生成分享链接：{animation_id} -> {share_code}")
+        # 直接写入随机分享码，由唯一索引检测冲突（极少发生），冲突时换一个重试。
+        # rollback 会使会话内对象过期，之后不再访问 ORM 对象属性。
+        user_id = current_user.id
+        share_code = None
+        for _ in range(_SHARE_CODE_MAX_ATTEMPTS):
+            candidate = _new_share_code()
+            save_stmt = (
+                update(Animation)
+                .where(Animation.id == animation_id, Animation.share_code.is_(None))
+                .values(share_code=candidate)
+                .execution_options(synchronize_session=False)
+            )
+            try:
+                save_result = await db.execute(save_stmt)
+                await db.commit()
+            except IntegrityError:
+                await db.rollback()
+                continue
+            if save_result.rowcount == 0:
+                # 并发请求已先生成了分享码，返回已有的
+                share_code = await db.scalar(
+                    select(Animation.share_code).where(Animation.id == animation_id)
+                )
+            else:
+                share_code = candidate
+            break
+        
+        if not share_code:
+            raise HTTPException(status_code=500, detail="生成失败：分享码冲突，请重试")
+        
+        # 广场详情中包含 share_code
+        await invalidate_animation(animation_id)
+        
+        share_url = _SHARE_PATH_PREFIX + share_code
+        
+        log.info(f"用户 {user_id} 生成分享链接：{animation_id} -> {share_code}")
         
         return ApiResponse.ok({
             "share_code": share_code,
@@ -724,6 +924,7 @@ async def generate_share_link(
 @router.get("/play/{share_code}", response_model=ApiResponse)
 async def get_animation_by_share_code(
     share_code: str,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -736,12 +937,22 @@ async def get_animation_by_share_code(
     - 完整的动画信息和 scene_data
     """
     try:
-        stmt = select(Animation).where(Animation.share_code == share_code)
+        cache_key = share_key(share_code)
+        cached = await cache_get(cache_key)
+        if cached is not None:
+            return public_ok_response(request, cached)
+        
+        stmt = (
+            select(Animation, User.phone_number)
+            .outerjoin(User, Animation.user_id == User.id)
+            .where(Animation.share_code == share_code)
+        )
         result = await db.execute(stmt)
-        animation = result.scalar_one_or_none()
+        row = result.one_or_none()
         
-        if not animation:
+        if not row:
             return ApiResponse.error(404, "分享链接不存在或已失效")
+        animation, phone = row
         
         anim_data = {
             "id": animation.id,
@@ -749,19 +960,15 @@ async def get_animation_by_share_code(
             "description": animation.description,
             "scene_data": animation.scene_data,
             "like_count": animation.like_count,
-            "created_at": animation.created_at.isoformat()
+            "created_at": animation.created_at
         }
         
         # 如果作者选择公开用户名
-        if animation.show_author:
-            user_stmt = select(User).where(User.id == animation.user_id)
-            user_result = await db.execute(user_stmt)
-            user = user_result.scalar_one_or_none()
-            if user:
-                phone = user.phone_number
-                anim_data["author_name"] = f"{phone[:3]}****{phone[-4:]}"
-        
-        return ApiResponse.ok(anim_data)
+        if animation.show_author and phone:
+            anim_data["author_name"] = mask_phone_number(phone)
+        
+        await cache_set(cache_key, anim_data)
+        return public_ok_response(request, anim_data)
         
     except HTTPException:
         raise
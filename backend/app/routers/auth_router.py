@@ -16,13 +16,13 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pydantic import BaseModel, Field
-from datetime import datetime
-import re
+from datetime import datetime, timezone
 
 from ..models.user import User
-from ..services.auth_service import hash_password, verify_password, create_access_token, decode_access_token
+from ..services.auth_service import hash_password_async, verify_password_async, create_access_token, decode_access_token_cached, load_user
 from ..config.database import get_db
 from ..models.response_schema import ApiResponse
+from ..utils.phone_utils import validate_phone_number, mask_phone_number
 
 router = APIRouter()
 
@@ -50,35 +50,6 @@ class UserResponse(BaseModel):
 # 工具函数
 # ============================================================================
 
-def validate_phone_number(phone: str) -> bool:
-    """
-    校验中国大陆手机号格式
-    
-    Args:
-        phone: 手机号字符串
-        
-    Returns:
-        是否符合格式
-    """
-    pattern = r'^1[3-9]\d{9}$'
-    return bool(re.match(pattern, phone))
-
-
-def mask_phone_number(phone: str) -> str:
-    """
-    脱敏手机号：138****8888
-    
-    Args:
-        phone: 原始手机号
-        
-    Returns:
-        脱敏后的手机号
-    """
-    if len(phone) == 11:
-        return f"{phone[:3]}****{phone[7:]}"
-    return phone
-
-
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_db)
@@ -101,7 +72,7 @@ async def get_current_user(
     if not token:
         return None
     
-    payload = decode_access_token(token)
+    payload = decode_access_token_cached(token)
     if not payload:
         return None
     
@@ -109,9 +80,7 @@ async def get_current_user(
     if not user_id:
         return None
     
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    return user
+    return await load_user(db, user_id)
 
 
 # ============================================================================
@@ -151,7 +120,7 @@ async def register(req: RegisterRequest, db: AsyncSession = Depends(get_db)):
         )
     
     # 创建用户
-    hashed_pwd = hash_password(req.password)
+    hashed_pwd = await hash_password_async(req.password)
     new_user = User(
         phone_number=req.phone_number,
         hashed_password=hashed_pwd
@@ -197,14 +166,15 @@ async def login(
     user = result.scalar_one_or_none()
     
     # 验证用户和密码
-    if not user or not verify_password(password, user.hashed_password):
+    if not user or not await verify_password_async(password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="手机号或密码错误"
         )
     
     # 更新最后登录时间
-    user.last_login = datetime.utcnow()
+    # 以 UTC 存储（SQLite DateTime 不保存时区信息）
+    user.last_login = datetime.now(timezone.utc)
     await db.commit()
     
     # 生成 Token
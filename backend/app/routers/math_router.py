@@ -23,7 +23,7 @@ router = APIRouter()
 
 @router.post("/upload", response_model=ApiResponse)
 async def upload_image(file: UploadFile = File(...)):
-    path = save_upload_file("math", file)
+    path = await save_upload_file("math", file)
     log.info(f"Math image saved: {path}")
     return ApiResponse.ok({"path": str(path)})
 
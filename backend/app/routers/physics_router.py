@@ -2,19 +2,20 @@
 物理模拟路由（含豆包多模态接入、元素参数聚合与精灵裁剪）
 ---------------------------------
 功能：
-- `/upload`：接收前端图片并保存到 `uploads/physics`，同步执行两步：
+- `/upload`：接收前端图片并保存到 `uploads/physics`，并发执行两步（预热提交到后台线程、不等待完成，豆包为异步调用）：
   1) 预热 SAM embedding（避免首次交互卡顿）；
   2) 调用豆包多模态分析图片，返回识别到的元素及耗时；
    响应包含：
    - `path`：图片保存路径；
-   - `embed_ms`：预热耗时；
+   - `embed_ms`：预热耗时（响应返回时预热尚未完成则为 null，响应不再等待预热）；
    - `ai_ms`：多模态识别耗时（失败时为 -1）；
    - `elements`：简化名称数组；
    - `elements_detailed`：规范化后的元素详情（含 `id`/`display_name`/`role`/`parameters`），对同名元素自动做 A/B 标注；
    - `analysis`：保留 `assumptions` 与 `confidence` 等额外信息；
    - `doubao_error`：当多模态调用异常时的错误信息。
-- `/segment`：根据点或框选调用 SAM 生成掩码，提取轮廓坐标（像素坐标）。
-- `/simulate`：接收图片路径、元素名称集合与各自轮廓坐标，使用 OpenCV 精准裁剪每个元素的精灵图，返回 `objects` 列表（含 `sprite_data_url` 与坐标）。
+- `/segment`：根据点或框选调用 SAM 生成掩码，提取轮廓坐标（像素坐标）；传入 `point_batches` 时一次批量分割多个物体并返回 `contours`；
+  `binary=true` 时以 `application/octet-stream` 返回原始 int32 坐标（见 `_pack_contour`），前端可直接 `new Int32Array(buffer)`；在线程池中执行（可能需等待该图片的后台预热），不阻塞事件循环。
+- `/simulate`：接收图片路径、元素名称集合与各自轮廓坐标，使用 OpenCV 精准裁剪每个元素的精灵图（一次读图，批量裁剪），返回 `objects` 列表（含 `sprite_url` 与坐标）。
 
 本次修改（刚体碰撞参数透传）：
 - `/simulate` 增强：除名称与轮廓外，支持透传每个元素的 `role` 与 `parameters`（初速度、摩擦、弹性等），
@@ -22,26 +23,31 @@
 
 本次修改（动态物体消除 + 背景修复）：
 - 在 `/simulate` 汇总所有 `role=dynamic` 的轮廓，调用 OpenCV inpaint 移除图中的动态物体并修复背景；
-- 响应新增 `background_clean_data_url` 字段（PNG data URL），前端直接作为背景显示。
+- 响应新增 `background_clean_url` 字段，前端直接作为背景显示。
+- 精灵图（PNG）与清理后背景（JPEG）写入 `uploads/physics/sprites|inpainted/`，按输入摘要命名、可跨请求复用，
+  响应中只返回 `/uploads/...` 静态资源 URL（不再内嵌 base64 data URL，省去编码开销与 33% 体积膨胀）。
 
 后续扩展：
 - 在 `/simulate` 中整合几何参数提取与元素参数合并，返回给前端用作真实物理引擎模拟；
 - 在 `/upload` 增加题目文本，以提升参数推断准确性。
 """
 
-from fastapi import APIRouter, UploadFile, File
-from typing import Dict, List
+import asyncio
+import struct
+
+from fastapi import APIRouter, Response, UploadFile, File
+from typing import Any, Dict, List
 from uuid import uuid4
 
 import numpy as np
 
-from ..models.response_schema import ApiResponse
+from ..models.response_schema import ApiResponse, ok_response
 from ..models.physics_schema import PhysicsSegmentRequest, PhysicsSimulateRequest
-from ..utils.file_utils import save_upload_file
+from ..utils.file_utils import save_upload_file_hashed, upload_url
 from ..utils.logger import log
-from ..services.segment_service import segment_with_points, segment_with_box, preload_image
+from ..services.segment_service import segment_with_points, segment_with_box, segment_with_point_batches, preload_image
 from ..services.multimodal_service import analyze_physics_image
-from ..services.opencv_service import extract_sprite, inpaint_remove_objects
+from ..services.opencv_service import save_sprites_batch, save_inpainted_background
 
 
 router = APIRouter()
@@ -169,29 +175,72 @@ def _normalize_elements(full: Dict[str, object] | None) -> List[Dict[str, object
     return normalized
 
 
+def _contour_array(pts: List[Any]) -> np.ndarray:
+    """将 `Point | {x,y} | (x,y)` 混合形态的轮廓解析为 `(N, 2)` int32 数组。
+
+    先收集为扁平坐标列表后一次性转换为数组；含无法转换的坐标时退回逐点解析并丢弃该点（与旧行为一致）。
+    """
+    flat: List[Any] = []
+    for p in pts:
+        if isinstance(p, dict):
+            flat += (p.get("x", 0), p.get("y", 0))
+        elif isinstance(p, (list, tuple)):
+            if len(p) >= 2:
+                flat += (p[0], p[1])
+        elif hasattr(p, "x") and hasattr(p, "y"):
+            flat += (p.x, p.y)
+    try:
+        arr = np.asarray(flat, dtype=np.float64)
+        if np.isfinite(arr).all():  # None 会被转换为 NaN，交给逐点解析丢弃
+            return arr.astype(np.int32).reshape(-1, 2)
+    except (TypeError, ValueError):
+        pass
+    pairs = []
+    for i in range(0, len(flat), 2):
+        try:
+            pairs.append((int(flat[i]), int(flat[i + 1])))
+        except (TypeError, ValueError):
+            pass
+    return np.array(pairs, dtype=np.int32).reshape(-1, 2)
+
+
+def _contour_points(contour: np.ndarray) -> List[Dict[str, int]]:
+    """`(N, 2)` 轮廓数组 → `[{x, y}, ...]`（JSON 响应格式）；一次 tolist() 转为 Python int。"""
+    return [{"x": x, "y": y} for x, y in contour.tolist()]
+
+
+def _pack_contour(contour: np.ndarray) -> bytes:
+    """二进制轮廓：uint32 小端点数 N，随后 N 组 int32 小端 x, y（均 4 字节对齐）。"""
+    return struct.pack("<I", len(contour)) + np.ascontiguousarray(contour, dtype="<i4").tobytes()
+
+
+def _binary_response(payload: bytes) -> Response:
+    return Response(content=payload, media_type="application/octet-stream")
+
+
 @router.post("/upload", response_model=ApiResponse)
 async def upload_image(file: UploadFile = File(...)):
     """保存物理模拟图片，预热 embedding 并调用豆包分析，返回元素与耗时。
 
     返回字段说明：
     - `path`: 图片在后端的保存路径（字符串）。
-    - `embed_ms`: 预热 embedding 的耗时（毫秒）。
+    - `embed_ms`: 预热 embedding 的耗时（毫秒），命中 embedding 缓存时为 0；预热仍在后台进行时为 null。
     - `ai_ms`: 豆包多模态分析耗时（毫秒），当为 -1 表示调用失败或未启用。
     - `elements`: 模型识别到的元素名称数组（已做简化）。
     - `doubao_error`: 当调用异常时附带错误信息，方便前端直观展示问题来源。
     """
-    save_path = save_upload_file("physics", file)
+    save_path, sha = await save_upload_file_hashed("physics", file)
     log.info(f"Physics image saved: {save_path}")
-    # 同步预热：计算该图片的 embedding，避免用户首次交互等待
-    embed_ms = preload_image(str(save_path))
-    # 同步调用豆包多模态分析（若失败不影响上传流程）
+    # 预热 embedding 提交到后台线程后立即继续，不等待编码器完成（首次分割前会等待未完成的预热）；
+    # 预热与豆包多模态分析并发进行，preload_image 自身吞掉异常
+    preload = preload_image(str(save_path), sha)
     ai_ms = -1
     elements: list[str] = []
     elements_detailed: list[Dict[str, object]] = []
     analysis: Dict[str, object] | None = None
     doubao_error: str | None = None
     try:
-        ai_result = analyze_physics_image(str(save_path))
+        ai_result = await analyze_physics_image(str(save_path))
         ai_ms = int(ai_result.get("ai_ms", -1))
         elements = ai_result.get("elements", [])
         full = ai_result.get("full")
@@ -205,8 +254,9 @@ async def upload_image(file: UploadFile = File(...)):
     except Exception as e:
         log.error(f"AI 分析失败（忽略并继续）：{e}")
         doubao_error = str(e)
+    embed_ms = preload.result() if preload.done() else None
 
-    return ApiResponse.ok({
+    return ok_response({
         "path": str(save_path),
         "embed_ms": embed_ms,
         "ai_ms": ai_ms,
@@ -223,23 +273,36 @@ async def segment(req: PhysicsSegmentRequest):
     if not req.image_path:
         return ApiResponse.error("请先上传图片后再进行分割")
 
+    if req.point_batches:
+        # 多物体：多组点提示一次解码
+        batches = [[(p.x, p.y) for p in group] for group in req.point_batches]
+        try:
+            contours = await asyncio.to_thread(segment_with_point_batches, req.image_path, batches)
+        except Exception as e:
+            log.error(f"SAM 批量分割失败: {e}")
+            return ApiResponse.error("分割失败，请检查模型与依赖")
+        if req.binary:
+            # uint32 小端轮廓数 M，随后依次为 M 条 `_pack_contour` 格式的轮廓
+            return _binary_response(struct.pack("<I", len(contours)) + b"".join(map(_pack_contour, contours)))
+        return ok_response({"contours": [_contour_points(c) for c in contours]})
+
     try:
-        contour = []
         if req.box:
             # 优先使用框选
             bx = tuple(int(v) for v in req.box)
-            contour = segment_with_box(req.image_path, bx)
+            contour = await asyncio.to_thread(segment_with_box, req.image_path, bx)
         else:
             # 退化为点提示
             pts = [(p.x, p.y) for p in (req.points or [])]
-            contour = segment_with_points(req.image_path, pts)
+            contour = await asyncio.to_thread(segment_with_points, req.image_path, pts)
     except Exception as e:
         log.error(f"SAM 分割失败: {e}")
         return ApiResponse.error("分割失败，请检查模型与依赖")
 
     log.info(f"Segment contour points: {len(contour)}")
-    contour_dicts = [{"x": int(x), "y": int(y)} for (x, y) in contour]
-    return ApiResponse.ok({"contour": contour_dicts})
+    if req.binary:
+        return _binary_response(_pack_contour(contour))
+    return ok_response({"contour": _contour_points(contour)})
 
 
 @router.post("/simulate", response_model=ApiResponse)
@@ -269,27 +332,22 @@ async def simulate(req: PhysicsSimulateRequest):
         names = list(req.elements_simple or [])
         roles_in = list(req.roles or [])
         params_in = list(req.parameters_list or [])
-    dyn_contours: List[List[tuple[int, int]]] = []
+    dyn_contours: List[np.ndarray] = []
     try:
-        for i, pts in enumerate(req.contours or []):
-            # 兼容多形态：Point | dict{x,y} | (x,y)
-            contour_xy = []
-            for p in pts:
-                try:
-                    if hasattr(p, "x") and hasattr(p, "y"):
-                        contour_xy.append((int(p.x), int(p.y)))
-                    elif isinstance(p, dict):
-                        contour_xy.append((int(p.get("x", 0)), int(p.get("y", 0))))
-                    elif isinstance(p, (list, tuple)) and len(p) >= 2:
-                        contour_xy.append((int(p[0]), int(p[1])))
-                except Exception:
-                    pass
-            sprite_url = None
-            try:
-                if req.image_path:
-                    sprite_url = extract_sprite(req.image_path, contour_xy)
-            except Exception as e:
-                log.error(f"extract_sprite failed: {e}")
+        # 兼容多形态：Point | dict{x,y} | (x,y)，每个轮廓一次解析为 int32 数组，后续直接交给 OpenCV
+        contours_xy = [_contour_array(pts) for pts in req.contours or []]
+        # 所有元素共用一次读图与 BGRA 转换，批量裁剪精灵并落盘，返回静态资源 URL 而非 base64
+        sprite_urls: List[str | None] = [None] * len(contours_xy)
+        try:
+            if req.image_path and contours_xy:
+                sprite_urls = [
+                    upload_url(p) if p is not None else None
+                    for p in save_sprites_batch(req.image_path, contours_xy)
+                ]
+        except Exception as e:
+            log.error(f"save_sprites_batch failed: {e}")
+        for i, contour_xy in enumerate(contours_xy):
+            sprite_url = sprite_urls[i]
             name = names[i] if i < len(names) else f"elem-{i}"
             role = None
             params = None
@@ -303,12 +361,12 @@ async def simulate(req: PhysicsSimulateRequest):
                 "name": name,
                 "role": role or "unknown",
                 "parameters": params or {},
-                "sprite_data_url": sprite_url,
-                "contour": [{"x": x, "y": y} for (x, y) in contour_xy],
+                "sprite_url": sprite_url,
+                "contour": [{"x": x, "y": y} for x, y in contour_xy.tolist()],
             })
             # 收集需要从背景中移除的元素轮廓（动态物体 + 约束类元素如弹簧）
             # 2025-11-25 更新：弹簧的 role 为 "constraint"，也需要从背景中移除
-            if contour_xy and ((role or "unknown") == "dynamic" or (role or "unknown") == "constraint"):
+            if len(contour_xy) and ((role or "unknown") == "dynamic" or (role or "unknown") == "constraint"):
                 dyn_contours.append(contour_xy)
     except Exception as e:
         log.error(f"simulate failed: {e}")
@@ -317,14 +375,14 @@ async def simulate(req: PhysicsSimulateRequest):
     background_clean = None
     try:
         if req.image_path and dyn_contours:
-            background_clean = inpaint_remove_objects(req.image_path, dyn_contours)
+            background_clean = upload_url(save_inpainted_background(req.image_path, dyn_contours))
     except Exception as e:
         log.error(f"inpaint background failed: {e}")
 
     payload: Dict[str, object] = {
         "simulation_id": task_id,
         "objects": objects,
-        "background_clean_data_url": background_clean,
+        "background_clean_url": background_clean,
     }
     log.info(f"Create simulate task: id={task_id}, count={len(objects)}")
-    return ApiResponse.ok(payload)
+    return ok_response(payload)
@@ -7,27 +7,49 @@
 - 提供认证相关的核心工具函数
 
 使用：
-- 注册时：hash_password() 对密码加密
-- 登录时：verify_password() 验证密码
+- 注册时：hash_password() 对密码加密（路由中使用 hash_password_async()，在线程池执行）
+- 登录时：verify_password() 验证密码（路由中使用 verify_password_async()）
 - 生成Token：create_access_token()
-- 验证Token：decode_access_token()
+- 验证Token：decode_access_token()（鉴权依赖中使用 decode_access_token_cached()，按 Token 摘要短时缓存解码结果）
+- 按 user_id 加载用户：load_user()（短 TTL 缓存用户基本信息，鉴权时免去每次查库）
+- 公开接口可选登录：get_optional_user_id()（只解码 Token，不查库）
 """
 
+import asyncio
+import hashlib
+import time
+
 from passlib.context import CryptContext
 from jose import JWTError, jwt
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
 from fastapi.security.http import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from ..config.settings import JWT_SECRET_KEY, JWT_ALGORITHM, JWT_EXPIRE_MINUTES
+from ..config.settings import get_settings
 from ..config.database import get_db
 from ..models.user import User
+from .cache_service import cache_get, cache_set, user_key
+from ..utils.cache_utils import TTLCache
 
 # 密码加密上下文（使用 bcrypt）
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# JWT 参数在导入时预先解析，签发/校验 Token 时直接复用
+_settings = get_settings()
+_JWT_SECRET_KEY_BYTES = _settings.jwt_secret_key.encode("utf-8")
+_JWT_ALGORITHM = _settings.jwt_algorithm
+_JWT_ALGORITHMS = [_settings.jwt_algorithm]
+_JWT_EXPIRE_DELTA = timedelta(minutes=_settings.jwt_expire_minutes)
+
+# 鉴权用户缓存时长（秒）：只缓存不会变化的 id / phone_number
+_USER_CACHE_TTL = 60
+
+# Token 解码结果缓存时长（秒）：同一 Token 的连续请求免去重复验签；不会超过 Token 自身的 exp
+_TOKEN_CACHE_TTL = 30
+_token_cache = TTLCache(maxsize=1024, ttl=_TOKEN_CACHE_TTL)
+
 
 def hash_password(password: str) -> str:
     """
@@ -56,6 +78,16 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def hash_password_async(password: str) -> str:
+    """在线程池中执行 `hash_password`：bcrypt 为 CPU 密集型计算，直接在协程中调用会阻塞事件循环。"""
+    return await asyncio.to_thread(pwd_context.hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """在线程池中执行 `verify_password`，用于异步路由。"""
+    return await asyncio.to_thread(pwd_context.verify, plain_password, hashed_password)
+
+
 def create_access_token(data: dict) -> str:
     """
     创建 JWT Token
@@ -69,11 +101,11 @@ def create_access_token(data: dict) -> str:
     to_encode = data.copy()
     
     # 计算过期时间
-    expire = datetime.utcnow() + timedelta(minutes=JWT_EXPIRE_MINUTES)
+    expire = datetime.now(timezone.utc) + _JWT_EXPIRE_DELTA
     to_encode.update({"exp": expire})
     
     # 编码生成 Token
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _JWT_SECRET_KEY_BYTES, algorithm=_JWT_ALGORITHM)
     return encoded_jwt
 
 
@@ -88,14 +120,69 @@ def decode_access_token(token: str) -> dict | None:
         解码后的数据字典，验证失败返回 None
     """
     try:
-        payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+        payload = jwt.decode(token, _JWT_SECRET_KEY_BYTES, algorithms=_JWT_ALGORITHMS)
         return payload
     except JWTError:
         return None
 
 
+def decode_access_token_cached(token: str) -> dict | None:
+    """
+    带进程内缓存的 `decode_access_token`（供鉴权依赖使用）
+    
+    以 Token 的 blake2b 摘要为键缓存解码后的 payload，缓存时长取 `_TOKEN_CACHE_TTL`
+    与 Token 剩余有效期中的较小值，因此过期的 Token 不会因缓存而继续通过校验。
+    验证失败的 Token 不缓存。
+    
+    Args:
+        token: JWT Token 字符串
+        
+    Returns:
+        解码后的数据字典，验证失败返回 None
+    """
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = _token_cache.get(key)
+    if payload is not None:
+        return payload
+    
+    payload = decode_access_token(token)
+    if payload:
+        ttl = min(_TOKEN_CACHE_TTL, payload.get("exp", 0) - time.time())
+        if ttl > 0:
+            _token_cache.set(key, payload, ttl)
+    return payload
+
+
+async def load_user(db: AsyncSession, user_id: int) -> User | None:
+    """
+    按 user_id 获取用户（供鉴权依赖使用）
+    
+    命中缓存时返回仅包含 id 与 phone_number 的游离 User 对象（未加入会话），
+    路由中只应读取这两个字段；需要其它字段时请自行查询数据库。
+    
+    Args:
+        db: 数据库会话
+        user_id: 用户ID
+        
+    Returns:
+        用户对象，不存在返回 None
+    """
+    key = user_key(user_id)
+    cached = await cache_get(key)
+    if cached is not None:
+        return User(id=cached["id"], phone_number=cached["phone_number"])
+    
+    result = await db.execute(select(User).where(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user:
+        await cache_set(key, {"id": user.id, "phone_number": user.phone_number}, ttl=_USER_CACHE_TTL)
+    return user
+
+
 # HTTP Bearer 认证方案
 security = HTTPBearer()
+# 可选认证：未携带 Token 时不报错（用于公开接口中的个性化字段）
+optional_security = HTTPBearer(auto_error=False)
 
 
 async def get_current_user(
@@ -122,7 +209,7 @@ async def get_current_user(
     """
     # 解码 Token
     token = credentials.credentials
-    payload = decode_access_token(token)
+    payload = decode_access_token_cached(token)
     
     if not payload:
         raise HTTPException(
@@ -138,10 +225,8 @@ async def get_current_user(
             detail="Token 格式错误"
         )
     
-    # 查询用户
-    stmt = select(User).where(User.id == user_id)
-    result = await db.execute(stmt)
-    user = result.scalar_one_or_none()
+    # 查询用户（带缓存）
+    user = await load_user(db, user_id)
     
     if not user:
         raise HTTPException(
@@ -152,5 +237,23 @@ async def get_current_user(
     return user
 
 
-
-
+async def get_optional_user_id(
+    credentials: HTTPAuthorizationCredentials | None = Depends(optional_security),
+) -> int | None:
+    """
+    可选登录（依赖注入函数）：从 Token 中取出 user_id，不查询数据库
+    
+    未携带 Token 或 Token 无效时返回 None（按匿名访问处理），供公开接口附加个性化字段使用。
+    
+    Args:
+        credentials: HTTP Bearer Token（可缺省）
+        
+    Returns:
+        user_id，未登录返回 None
+    """
+    if credentials is None:
+        return None
+    payload = decode_access_token_cached(credentials.credentials)
+    if not payload:
+        return None
+    return payload.get("user_id")
@@ -0,0 +1,133 @@
+"""
+接口结果缓存服务（Redis / 进程内回退）
+---------------------------------
+功能：
+- 为读多写少的公开接口（广场列表、广场详情、分享页）提供统一的异步缓存读写与失效；
+- 缓存鉴权依赖中按 user_id 查询到的用户基本信息（见 `auth_service.load_user`）；
+- 配置 `REDIS_URL` 且已安装 `redis` 时使用 Redis（多 worker 共享，失效即时生效）；
+- 否则回退到进程内 `TTLCache`（每个 worker 独立，依赖 TTL 兜底）。
+
+使用说明：
+- 应用启动时调用 `init_cache()`，关闭时调用 `close_cache()`（见 main.py 的 lifespan）；
+- 缓存值需可 JSON 序列化（使用 orjson 编解码）；
+- Redis 不可用时读写异常只记录日志，接口回落为直接查询数据库。
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+import orjson
+
+from ..config.settings import get_settings
+from ..utils.cache_utils import TTLCache
+from ..utils.logger import log
+
+# 缓存键
+PLAZA_LIST_KEY = "plaza:animations:v1"
+PLAZA_DETAIL_PREFIX = "plaza:anim:"
+SHARE_PREFIX = "share:"
+USER_PREFIX = "user:"
+
+DEFAULT_TTL = 60
+
+_redis = None  # redis.asyncio.Redis 实例（配置了 REDIS_URL 时）
+_local = TTLCache(maxsize=512, ttl=DEFAULT_TTL)
+
+
+def plaza_detail_key(animation_id: int) -> str:
+    return f"{PLAZA_DETAIL_PREFIX}{animation_id}"
+
+
+def share_key(share_code: str) -> str:
+    return f"{SHARE_PREFIX}{share_code}"
+
+
+def user_key(user_id: int) -> str:
+    return f"{USER_PREFIX}{user_id}"
+
+
+async def init_cache() -> None:
+    """连接 Redis；未配置或连接失败时使用进程内缓存。"""
+    global _redis
+    url = get_settings().redis_url
+    if not url:
+        log.info("cache: 未配置 REDIS_URL，使用进程内缓存")
+        return
+    try:
+        import redis.asyncio as aioredis
+    except Exception as e:
+        log.error(f"cache: redis 未安装，使用进程内缓存: {e}")
+        return
+    client = aioredis.from_url(url)
+    try:
+        await client.ping()
+    except Exception as e:
+        log.error(f"cache: Redis 连接失败，使用进程内缓存: {e}")
+        await client.aclose()
+        return
+    _redis = client
+    log.info(f"cache: 已连接 Redis {url}")
+
+
+async def close_cache() -> None:
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+async def cache_get(key: str) -> Any | None:
+    """读取缓存；未命中或出错时返回 None。"""
+    if _redis is None:
+        return _local.get(key)
+    try:
+        raw = await _redis.get(key)
+    except Exception as e:
+        log.error(f"cache_get failed: {key} -> {e}")
+        return None
+    return orjson.loads(raw) if raw is not None else None
+
+
+async def cache_set(key: str, value: Any, ttl: int = DEFAULT_TTL) -> None:
+    if _redis is None:
+        _local.set(key, value, ttl)
+        return
+    try:
+        await _redis.set(key, orjson.dumps(value), ex=ttl)
+    except Exception as e:
+        log.error(f"cache_set failed: {key} -> {e}")
+
+
+async def cache_delete(*keys: str) -> None:
+    if not keys:
+        return
+    if _redis is None:
+        for key in keys:
+            _local.delete(key)
+        return
+    try:
+        await _redis.delete(*keys)
+    except Exception as e:
+        log.error(f"cache_delete failed: {keys} -> {e}")
+
+
+async def cache_delete_prefix(prefix: str) -> None:
+    """删除以 `prefix` 开头的所有键（Redis 下使用 SCAN，避免阻塞）。"""
+    if _redis is None:
+        _local.delete_prefix(prefix)
+        return
+    try:
+        keys = [k async for k in _redis.scan_iter(match=f"{prefix}*", count=500)]
+        if keys:
+            await _redis.delete(*keys)
+    except Exception as e:
+        log.error(f"cache_delete_prefix failed: {prefix} -> {e}")
+
+
+async def invalidate_animation(animation_id: int, share_code: str | None = None) -> None:
+    """动画公开状态、点赞数或内容变化后，失效广场列表、广场详情与分享页缓存。"""
+    keys = [PLAZA_LIST_KEY, plaza_detail_key(animation_id)]
+    if share_code:
+        keys.append(share_key(share_code))
+    await cache_delete(*keys)
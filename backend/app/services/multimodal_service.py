@@ -9,36 +9,74 @@
 
 使用说明：
 - 需在环境中设置 `ARK_API_KEY`，可选设置 `ARK_BASE_URL` 与 `DOUBAO_MODEL_ID`；
+- 使用 `AsyncOpenAI` 异步调用，等待模型响应期间不占用线程池，事件循环可继续处理其它请求；
+- 客户端为进程级单例，底层 httpx 连接池复用与方舟的 TCP/TLS 连接（安装 `h2` 时启用 HTTP/2），应用关闭时由 `close_client()` 释放；
 - 若模型输出含额外文本，服务会尝试提取首个 JSON 区块；
  - 返回包含耗时 `ai_ms` 与 `elements`（简化名称数组）及 `full`（完整结构）。
 """
 from __future__ import annotations
 
-import json
+import asyncio
 import re
 import time
 from typing import Any, Dict, List, Optional
 
-from ..config.settings import ARK_BASE_URL, ARK_API_KEY, DOUBAO_MODEL_ID
+import orjson
+
+from ..config.settings import get_settings
 from ..utils.pictures_utils import image_to_data_url
 from ..utils.prompt_utils import physics_analysis_system_prompt, build_user_prompt
 from ..utils.logger import log
 
 
+# 模型输出中首个 `{` 到最后一个 `}` 的 JSON 区块
+_JSON_BLOCK_RE = re.compile(r"\{[\s\S]*\}")
+
+_client = None  # AsyncOpenAI 客户端单例（懒加载，仅在事件循环中使用）
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except Exception:  # 可选依赖：缺失时使用 HTTP/1.1 keep-alive
+        return False
+    return True
+
+
 def _get_client():
-    """创建 OpenAI 兼容客户端（豆包 Ark）。
+    """获取异步 OpenAI 兼容客户端（豆包 Ark），首次调用时创建并在进程内复用。
 
     - 使用 `base_url` 指向方舟推理端点；
     - 从环境读取 `ARK_API_KEY`；
+    - 传入带连接池的 httpx 客户端，后续请求复用已建立的连接，省去每次的握手耗时；
     - 若依赖缺失或密钥为空，抛出异常。
     """
+    global _client
+    if _client is not None:
+        return _client
     try:
-        from openai import OpenAI
+        import httpx
+        from openai import AsyncOpenAI
     except Exception as e:
         raise RuntimeError(f"openai SDK 未安装：{e}")
-    if not ARK_API_KEY:
+    settings = get_settings()
+    if not settings.ark_api_key:
         raise RuntimeError("ARK_API_KEY 未设置，请在环境变量中提供豆包 API Key")
-    return OpenAI(base_url=ARK_BASE_URL, api_key=ARK_API_KEY)
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+        http2=_http2_available(),
+        timeout=60.0,
+    )
+    _client = AsyncOpenAI(base_url=settings.ark_base_url, api_key=settings.ark_api_key, http_client=http_client)
+    return _client
+
+
+async def close_client() -> None:
+    """关闭客户端连接池（应用关闭时调用）。"""
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
 
 
 def _extract_json(text: str) -> Dict[str, Any]:
@@ -51,16 +89,16 @@ def _extract_json(text: str) -> Dict[str, Any]:
     if not text:
         return {}
     try:
-        return json.loads(text)
-    except Exception:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
         pass
     # 兼容模型返回带注释/说明的情况
-    m = re.search(r"\{[\s\S]*\}", text)
+    m = _JSON_BLOCK_RE.search(text)
     if m:
         block = m.group(0)
         try:
-            return json.loads(block)
-        except Exception:
+            return orjson.loads(block)
+        except orjson.JSONDecodeError:
             log.warning("extract_json: 正则块解析失败")
     return {}
 
@@ -76,7 +114,7 @@ def _simplify_elements(full: Dict[str, Any]) -> List[str]:
     return names
 
 
-def analyze_physics_image(image_path: str, user_text: Optional[str] = None) -> Dict[str, Any]:
+async def analyze_physics_image(image_path: str, user_text: Optional[str] = None) -> Dict[str, Any]:
     """调用豆包多模态分析物理场景并返回结构化结果。
 
     返回字典示例：
@@ -88,14 +126,15 @@ def analyze_physics_image(image_path: str, user_text: Optional[str] = None) -> D
     }
     """
     client = _get_client()
-    data_url = image_to_data_url(image_path)
+    # 读取图片并 base64 编码为阻塞操作，放入线程执行
+    data_url = await asyncio.to_thread(image_to_data_url, image_path)
     system_prompt = physics_analysis_system_prompt()
     user_prompt = build_user_prompt(user_text)
 
     t0 = time.perf_counter()
     try:
-        resp = client.chat.completions.create(
-            model=DOUBAO_MODEL_ID,
+        resp = await client.chat.completions.create(
+            model=get_settings().doubao_model_id,
             messages=[
                 {"role": "system", "content": system_prompt},
                 {
@@ -3,8 +3,11 @@ OpenCV 图像处理服务（裁剪精灵 + 智能背景填充）
 ---------------------------------
 功能：
 - `extract_sprite(image_path, contour)`：按多边形轮廓在原图上裁剪元素，输出带透明背景的 PNG data URL；
+- `SpriteExtractor(image_path)`：持有一张源图的 BGRA 画布与掩码暂存区，`extract(pts)` 逐个裁剪精灵并复用缓冲；
+- `save_sprites_batch(image_path, contours)`：用一个 `SpriteExtractor` 为多个元素批量裁剪精灵并写入 `SPRITE_DIR`，返回文件路径（`/simulate` 使用）；
 - `inpaint_remove_objects(image_path, contours, method='auto', dilate=5, radius=5)`：
-  将若干轮廓并集生成掩码，智能检测背景色并选择最佳填充策略，返回"已清理动态物体"的背景图（PNG data URL）。
+  将若干轮廓并集生成掩码，智能检测背景色并选择最佳填充策略，返回"已清理动态物体"的背景图（JPEG data URL）；
+- `save_inpainted_background(...)`：同上，但将 JPEG 写入 `INPAINTED_DIR` 并返回文件路径（`/simulate` 使用）。
 
 2025-12-08 更新（智能背景填充）：
 - 新增背景检测功能：采样图片边缘区域，检测背景是否为单色
@@ -15,19 +18,32 @@ OpenCV 图像处理服务（裁剪精灵 + 智能背景填充）
   * "telea" / "ns"：传统 OpenCV inpaint 算法（保留兼容）
 
 使用说明：
-- 坐标需与原图尺寸一致；`contours` 采用 `List[List[Tuple[int,int]]]`；
+- 坐标需与原图尺寸一致；`contours` 采用 `List[List[Tuple[int,int]]]`，每个轮廓也可直接传入 `(N, 2)` int32 数组（免去再次转换）；
 - 对于物理题图片（通常白底或单色背景），推荐使用 `method='auto'`；
-- 对于复杂纹理背景，可尝试 `method='telea'` 或 `method='ns'`。
+- 对于复杂纹理背景，可尝试 `method='telea'` 或 `method='ns'`；
+- 解码后的原图按 `(路径, 读取模式, mtime, 大小)` 做 LRU 缓存，`/simulate` 中多个元素裁剪与背景修复共用一次解码；
+- 落盘的精灵/背景按 `(源图路径, mtime, 大小, 轮廓坐标, 填充参数)` 的摘要命名，内容不可变：
+  相同输入再次请求时直接复用已有文件（不解码、不编码），经 `/uploads` 静态路由以图片 URL 返回前端，
+  避免 base64 膨胀与 JSON 中的大字符串编码；
+- 导入时按 `OPENCV_THREADS`（默认 CPU 核数 / `WEB_CONCURRENCY`）设置 OpenCV 线程数，多 worker 并发处理时不互相抢占 CPU；
+- 若 OpenCV 以 CUDA 编译且存在可用 GPU，掩码膨胀走 `cv2.cuda` 形态学滤波，否则使用 CPU（`cv2.cuda` 无 inpaint 实现，telea/ns 仍在 CPU 上执行）。
 """
 
 from __future__ import annotations
 
+from functools import lru_cache
+from pathlib import Path
 from typing import List, Tuple, Optional
 
 import base64
+import hashlib
+import os
+import tempfile
 import cv2
 import numpy as np
 
+from ..config.settings import INPAINTED_DIR, SPRITE_DIR, get_settings
+
 
 # ============================================================================
 # 背景填充配置（可根据需要调整）
@@ -39,14 +55,129 @@ _BG_SAMPLE_RATIO = 0.05
 # 颜色方差阈值（低于此值认为背景统一，建议 15~50）
 _BG_VARIANCE_THRESHOLD = 25
 
+# 背景检测前将图片缩小到的最大边长（统计量与分辨率无关，无需全分辨率扫描）
+_BG_DETECT_MAX_SIDE = 512
+
 # 近白色判定阈值（RGB 各通道 >= 此值视为白色）
 _BG_WHITE_THRESHOLD = 240
 
+# 输出编码参数：精灵需保留透明通道，用低压缩级别 PNG（编码快、体积略大）；
+# 清理后的背景不透明，用 JPEG（编码与传输体积均远小于 PNG）
+_SPRITE_PNG_PARAMS = [cv2.IMWRITE_PNG_COMPRESSION, 1]
+_BACKGROUND_JPEG_PARAMS = [cv2.IMWRITE_JPEG_QUALITY, 85]
+
+
+def _opencv_threads() -> int:
+    """每个 worker 的 OpenCV 线程数：显式配置优先，否则 CPU 核数按 worker 数均分（至少 1）。"""
+    settings = get_settings()
+    if settings.opencv_threads > 0:
+        return settings.opencv_threads
+    return max(1, (os.cpu_count() or 1) // max(1, settings.web_concurrency))
+
+
+# 进程级设置，只在导入时执行一次；OpenCV 默认按全部核数开线程，多 worker 下会超订
+cv2.setNumThreads(_opencv_threads())
+
+
+@lru_cache(maxsize=4)
+def _decode_image(path: str, flags: int, mtime_ns: int, size: int) -> np.ndarray | None:
+    # mtime/size 仅参与缓存键：文件被覆盖后键变化，旧条目随 LRU 淘汰
+    img = cv2.imread(path, flags)
+    if img is not None:
+        img.flags.writeable = False  # 缓存数组被多次复用，禁止调用方原地修改
+    return img
+
+
+def _load_image(path: str, flags: int) -> np.ndarray | None:
+    """读取图片（复用最近解码结果）；文件不存在或无法解码时返回 None。"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return _decode_image(path, flags, st.st_mtime_ns, st.st_size)
+
+
+def _source_id(path: str) -> str:
+    """源图标识（路径 + mtime + 大小），文件被覆盖后随之变化；文件不存在时抛出 FileNotFoundError。"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        raise FileNotFoundError(f"image not found: {path}") from None
+    return f"{path}\0{st.st_mtime_ns}\0{st.st_size}"
+
+
+def _asset_name(source: str, *parts: bytes) -> str:
+    """由源图标识与若干字节段（带长度前缀，避免拼接歧义）生成输出文件名摘要。"""
+    h = hashlib.blake2b(source.encode("utf-8"), digest_size=16)
+    for part in parts:
+        h.update(len(part).to_bytes(8, "little"))
+        h.update(part)
+    return h.hexdigest()
+
+
+def _write_atomic(path: Path, buf: np.ndarray) -> None:
+    """先写同目录临时文件再原子替换，并发请求或中途失败都不会留下半截文件。"""
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(buf.tobytes())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+@lru_cache(maxsize=16)
+def _rect_kernel(size: int) -> np.ndarray:
+    k = cv2.getStructuringElement(cv2.MORPH_RECT, (size, size))
+    k.flags.writeable = False
+    return k
+
+
+@lru_cache(maxsize=16)
+def _ellipse_kernel(size: int) -> np.ndarray:
+    k = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (size, size))
+    k.flags.writeable = False
+    return k
+
+
+def _cuda_available() -> bool:
+    try:
+        return cv2.cuda.getCudaEnabledDeviceCount() > 0
+    except Exception:  # 未以 CUDA 编译的 OpenCV 无 cv2.cuda 或调用报错
+        return False
+
+
+_USE_CUDA = _cuda_available()
+
+
+def _dilate(mask: np.ndarray, kernel: np.ndarray, iterations: int = 1) -> np.ndarray:
+    """膨胀单通道 uint8 掩码；有 CUDA 设备时在 GPU 上执行，失败则回退 CPU。"""
+    if _USE_CUDA:
+        try:
+            gpu_mask = cv2.cuda_GpuMat()
+            gpu_mask.upload(mask)
+            f = cv2.cuda.createMorphologyFilter(cv2.MORPH_DILATE, cv2.CV_8UC1, kernel, iterations=iterations)
+            return f.apply(gpu_mask).download()
+        except cv2.error:
+            pass
+    return cv2.dilate(mask, kernel, iterations=iterations)
+
 
 # ============================================================================
 # 背景检测相关函数
 # ============================================================================
 
+def _edge_margins(h: int, w: int) -> Tuple[int, int]:
+    """边缘采样带宽度（x 方向, y 方向），至少 1 像素。"""
+    return max(1, int(w * _BG_SAMPLE_RATIO)), max(1, int(h * _BG_SAMPLE_RATIO))
+
+
+def _edge_pixel_count(h: int, w: int) -> int:
+    margin_x, margin_y = _edge_margins(h, w)
+    return h * w - max(0, h - 2 * margin_y) * max(0, w - 2 * margin_x)
+
+
 def _detect_background_color(
     image: np.ndarray,
     object_mask: Optional[np.ndarray] = None,
@@ -54,55 +185,69 @@ def _detect_background_color(
     """检测图片背景色，判断背景是否统一。
 
     策略：采样图片四周边缘区域的像素，分析颜色分布。
+    大图先最近邻缩小到最大边 `_BG_DETECT_MAX_SIDE` 再统计：最近邻是像素抽样，
+    均值与方差保持不变（INTER_AREA 会平均邻域、压低噪声方差，使纹理背景被误判为统一）。
     """
     h, w = image.shape[:2]
-    margin_x = max(1, int(w * _BG_SAMPLE_RATIO))
-    margin_y = max(1, int(h * _BG_SAMPLE_RATIO))
-
-    # 创建边缘采样掩码
-    edge_mask = np.zeros((h, w), dtype=np.uint8)
-    edge_mask[0:margin_y, :] = 255          # 上
-    edge_mask[h - margin_y:h, :] = 255      # 下
-    edge_mask[:, 0:margin_x] = 255          # 左
-    edge_mask[:, w - margin_x:w] = 255      # 右
+    dilate_size = 15
+    scale = _BG_DETECT_MAX_SIDE / max(h, w)
+    if scale < 1:
+        sw, sh = max(1, round(w * scale)), max(1, round(h * scale))
+        # 缩小后边缘采样过少（极端长宽比）时保持原图
+        if _edge_pixel_count(sh, sw) >= 100:
+            image = cv2.resize(image, (sw, sh), interpolation=cv2.INTER_NEAREST)
+            if object_mask is not None:
+                object_mask = cv2.resize(object_mask, (sw, sh), interpolation=cv2.INTER_NEAREST)
+            # 物体周围的排除带按同比例缩小（保持奇数尺寸）
+            dilate_size = max(3, round(dilate_size * scale) | 1)
+            h, w = sh, sw
+    margin_x, margin_y = _edge_margins(h, w)
+
+    # 创建边缘采样掩码：整幅置 255 后清空内部矩形（两次连续写入替代四条边带分别赋值）；
+    # 用切片而非 cv2.rectangle，小图内部为空时切片自然为空，rectangle 则会交换角点误画
+    edge_mask = np.full((h, w), 255, dtype=np.uint8)
+    edge_mask[margin_y:h - margin_y, margin_x:w - margin_x] = 0
 
     # 排除物体区域
     if object_mask is not None:
-        kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (15, 15))
-        expanded = cv2.dilate(object_mask, kernel, iterations=2)
+        expanded = _dilate(object_mask, _ellipse_kernel(dilate_size), iterations=2)
         edge_mask = cv2.bitwise_and(edge_mask, cv2.bitwise_not(expanded))
 
-    edge_pixels = image[edge_mask > 0]
-
-    # 采样太少则回退到四角
-    if len(edge_pixels) < 100:
-        corners = [
-            image[0:margin_y*3, 0:margin_x*3],
-            image[0:margin_y*3, w-margin_x*3:w],
-            image[h-margin_y*3:h, 0:margin_x*3],
-            image[h-margin_y*3:h, w-margin_x*3:w],
-        ]
-        edge_pixels = np.vstack([c.reshape(-1, 3) for c in corners if c.size > 0])
+    # 采样太少则回退到四角（角区范围与边缘采样无关，不排除物体区域）
+    if cv2.countNonZero(edge_mask) < 100:
+        cy, cx = margin_y * 3, margin_x * 3
+        edge_mask = np.zeros((h, w), dtype=np.uint8)
+        edge_mask[0:cy, 0:cx] = 255
+        edge_mask[0:cy, max(0, w - cx):w] = 255
+        edge_mask[max(0, h - cy):h, 0:cx] = 255
+        edge_mask[max(0, h - cy):h, max(0, w - cx):w] = 255
 
-    if len(edge_pixels) == 0:
+    if cv2.countNonZero(edge_mask) == 0:
         return (255, 255, 255), False, 999.0
 
-    mean_color = np.mean(edge_pixels, axis=0).astype(np.uint8)
-    variance = float(np.mean(np.var(edge_pixels, axis=0)))
+    # 掩码内一次遍历同时得到均值与标准差，不再把边缘像素收集为 K×3 副本
+    mean, stddev = cv2.meanStdDev(image, mask=edge_mask)
+    mean_color = tuple(int(v) for v in mean.reshape(-1))
+    variance = float(np.mean(stddev.reshape(-1) ** 2))
     is_uniform = variance < _BG_VARIANCE_THRESHOLD
 
-    return tuple(mean_color.tolist()), is_uniform, variance
+    return mean_color, is_uniform, variance
 
 
 def _is_near_white(color: Tuple[int, int, int]) -> bool:
-    """判断颜色是否接近白色。"""
-    return all(c >= _BG_WHITE_THRESHOLD for c in color)
+    """判断颜色是否接近白色（最暗通道达到阈值即各通道均达到）。"""
+    return min(color) >= _BG_WHITE_THRESHOLD
 
 
-def _smart_fill(image: np.ndarray, mask: np.ndarray, method: str, radius: int) -> np.ndarray:
-    """根据方法填充被移除物体的区域。"""
+def _fill_masked(image: np.ndarray, mask: np.ndarray, color: Tuple[int, int, int]) -> np.ndarray:
+    """返回图片副本，掩码前景区域填充为纯色（单次 `np.copyto`，不生成花式索引的中间数组）。"""
     result = image.copy()
+    np.copyto(result, np.asarray(color, dtype=image.dtype), where=mask.astype(bool)[..., None])
+    return result
 
+
+def _smart_fill(image: np.ndarray, mask: np.ndarray, method: str, radius: int) -> np.ndarray:
+    """根据方法填充被移除物体的区域。"""
     # 传统 inpaint
     if method == "telea":
         return cv2.inpaint(image, mask, max(1, radius), cv2.INPAINT_TELEA)
@@ -111,29 +256,90 @@ def _smart_fill(image: np.ndarray, mask: np.ndarray, method: str, radius: int) -
 
     # 强制白色
     if method == "white":
-        result[mask > 0] = (255, 255, 255)
-        return result
+        return _fill_masked(image, mask, (255, 255, 255))
 
     # 自动检测或强制使用检测色
     bg_color, is_uniform, _ = _detect_background_color(image, mask)
 
     if method == "detected" or (method == "auto" and is_uniform):
         fill_color = (255, 255, 255) if _is_near_white(bg_color) else bg_color
-        result[mask > 0] = fill_color
-        return result
+        return _fill_masked(image, mask, fill_color)
 
     # auto 模式下背景不统一：默认白色
     if method == "auto":
-        result[mask > 0] = (255, 255, 255)
-        return result
+        return _fill_masked(image, mask, (255, 255, 255))
 
-    return result
+    return image.copy()
+
+
+def _as_polygons(contours: List[List[Tuple[int, int]]]) -> List[np.ndarray]:
+    """将坐标序列或 `(N, 2)` int32 数组转换为 OpenCV 多边形数组（N×1×2, int32，已是 int32 时不复制），丢弃不足 3 点的轮廓。"""
+    return [np.asarray(p, dtype=np.int32).reshape(-1, 1, 2) for p in contours if len(p) >= 3]
+
+
+def _polygons_mask(shape: Tuple[int, int], polys: List[np.ndarray]) -> np.ndarray:
+    """将若干多边形的并集栅格化为 uint8 掩码（前景 255）。
+
+    注意：`cv2.fillPoly(mask, polys, 255)` 一次传入多个多边形时按奇偶规则填充，
+    相互重叠的区域会被挖空（`drawContours(..., FILLED)` 同理）；
+    物体轮廓经常重叠（如斜面上的滑块），因此逐个填充以得到真正的并集。
+    """
+    mask = np.zeros(shape, dtype=np.uint8)
+    for pts in polys:
+        cv2.fillPoly(mask, [pts], 255)
+    return mask
 
 
 # ============================================================================
 # 原有函数（保留不变）
 # ============================================================================
 
+def _to_bgra(img: np.ndarray) -> np.ndarray:
+    """转换为 BGRA（整图一次）；原图已是 4 通道时直接返回（alpha 在裁剪时被轮廓掩码覆盖）。"""
+    if img.ndim == 2:
+        return cv2.cvtColor(img, cv2.COLOR_GRAY2BGRA)
+    if img.shape[2] == 4:
+        return img
+    return cv2.cvtColor(img, cv2.COLOR_BGR2BGRA)
+
+
+class SpriteExtractor:
+    """在同一张源图上裁剪多个元素精灵，BGRA 画布与掩码暂存区只分配一次、供所有轮廓复用。
+
+    每个轮廓只在其外接矩形范围内清零并栅格化掩码，再直接写入画布对应区域的 alpha 通道后编码该区域，
+    不再为每个元素分配掩码与裁剪副本。每次写入都会覆盖整个外接矩形的 alpha，因此轮廓相互重叠也不会串色。
+    """
+
+    def __init__(self, image_path: str) -> None:
+        img = _load_image(image_path, cv2.IMREAD_UNCHANGED)
+        if img is None:
+            raise FileNotFoundError(f"image not found: {image_path}")
+        bgra = _to_bgra(img)
+        # 4 通道原图即缓存中的只读数组，需复制一份作为可写画布；其余情况 cvtColor 已产生新数组
+        self._bgra = bgra if bgra.flags.writeable else bgra.copy()
+        self._mask = np.empty(self._bgra.shape[:2], dtype=np.uint8)
+
+    def extract(self, pts: np.ndarray) -> np.ndarray | None:
+        """按多边形（N×1×2, int32）裁剪，返回 PNG 编码缓冲；外接矩形与图片无交集时返回 None。"""
+        h, w = self._mask.shape
+        x, y, ww, hh = cv2.boundingRect(pts)
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + ww, w), min(y + hh, h)
+        if x1 <= x0 or y1 <= y0:
+            return None
+
+        sub_mask = self._mask[y0:y1, x0:x1]
+        sub_mask.fill(0)
+        cv2.fillPoly(sub_mask, [pts - np.array([x0, y0], dtype=np.int32)], 255)
+        region = self._bgra[y0:y1, x0:x1]
+        region[:, :, 3] = sub_mask
+
+        ok, buf = cv2.imencode(".png", region, _SPRITE_PNG_PARAMS)
+        if not ok:
+            raise RuntimeError("encode png failed")
+        return buf
+
+
 def extract_sprite(image_path: str, contour: List[Tuple[int, int]]) -> str:
     """根据多边形轮廓裁剪元素并返回 PNG data URL。
 
@@ -144,38 +350,49 @@ def extract_sprite(image_path: str, contour: List[Tuple[int, int]]) -> str:
 
     if not image_path:
         raise ValueError("image_path is required")
-    if not contour or len(contour) < 3:
+    if contour is None or len(contour) < 3:
         raise ValueError("contour must contain at least 3 points")
 
-    img = cv2.imread(image_path, cv2.IMREAD_UNCHANGED)
-    if img is None:
-        raise FileNotFoundError(f"image not found: {image_path}")
-
-    h, w = img.shape[:2]
-    mask = np.zeros((h, w), dtype=np.uint8)
-    pts = np.array(contour, dtype=np.int32).reshape((-1, 1, 2))
-    cv2.fillPoly(mask, [pts], 255)
-
-    # 转 BGRA，并使用 mask 作为 alpha 通道
-    if img.shape[2] == 4:
-        bgra = img.copy()
-        bgra[:, :, 3] = mask
-    else:
-        bgr = img if img.shape[2] == 3 else cv2.cvtColor(img, cv2.COLOR_BGRA2BGR)
-        bgra = cv2.cvtColor(bgr, cv2.COLOR_BGR2BGRA)
-        bgra[:, :, 3] = mask
-
-    # 裁剪到最小外接矩形，降低传输体积
-    x, y, ww, hh = cv2.boundingRect(pts)
-    cropped = bgra[y : y + hh, x : x + ww]
-
-    ok, buf = cv2.imencode(".png", cropped)
-    if not ok:
-        raise RuntimeError("encode png failed")
+    buf = SpriteExtractor(image_path).extract(_as_polygons([contour])[0])
+    if buf is None:
+        raise ValueError("contour lies outside the image")
     b64 = base64.b64encode(buf.tobytes()).decode("ascii")
     return f"data:image/png;base64,{b64}"
 
 
+def save_sprites_batch(image_path: str, contours: List[List[Tuple[int, int]]]) -> List[Optional[Path]]:
+    """批量裁剪多个元素的精灵图并写入 `SPRITE_DIR`，返回与 `contours` 等长的 PNG 文件路径列表。
+
+    文件名由源图标识与轮廓坐标决定，已存在时直接复用；仅在有未命中的轮廓时创建一个 `SpriteExtractor`
+    （一次读图与 BGRA 转换）。不足 3 点或位于图片之外的轮廓对应位置为 None。
+    """
+
+    if not image_path:
+        raise ValueError("image_path is required")
+
+    source = _source_id(image_path)
+    extractor: SpriteExtractor | None = None
+    paths: List[Optional[Path]] = []
+    for contour in contours:
+        if len(contour) < 3:
+            paths.append(None)
+            continue
+        pts = _as_polygons([contour])[0]
+        path = SPRITE_DIR / f"{_asset_name(source, pts.tobytes())}.png"
+        if path.exists():
+            paths.append(path)
+            continue
+        if extractor is None:
+            extractor = SpriteExtractor(image_path)
+        buf = extractor.extract(pts)
+        if buf is None:
+            paths.append(None)
+            continue
+        _write_atomic(path, buf)
+        paths.append(path)
+    return paths
+
+
 # ============================================================================
 # 改进后的主函数
 # ============================================================================
@@ -187,7 +404,7 @@ def inpaint_remove_objects(
     dilate: int = 5,
     radius: int = 5,
 ) -> str:
-    """根据多个轮廓区域移除图像中的对象并填充背景，返回 PNG data URL。
+    """根据多个轮廓区域移除图像中的对象并填充背景，返回 JPEG data URL。
 
     参数：
     - image_path: 原图绝对路径；
@@ -202,32 +419,59 @@ def inpaint_remove_objects(
     - radius: 修复半径（像素），仅 telea/ns 使用。
     """
 
+    buf = _inpaint_jpeg(image_path, contours, method, dilate, radius)
+    b64 = base64.b64encode(buf.tobytes()).decode("ascii")
+    return f"data:image/jpeg;base64,{b64}"
+
+
+def save_inpainted_background(
+    image_path: str,
+    contours: List[List[Tuple[int, int]]],
+    method: str = "auto",
+    dilate: int = 5,
+    radius: int = 5,
+) -> Path:
+    """与 `inpaint_remove_objects` 相同的处理，但将 JPEG 写入 `INPAINTED_DIR` 并返回文件路径。
+
+    相同源图、轮廓与参数的结果已存在时直接返回，不再解码与填充。
+    """
+
     if not image_path:
         raise ValueError("image_path is required")
-    if not contours or all(len(c) < 3 for c in contours):
+    polys = _as_polygons(contours or [])
+    params = f"{method}:{dilate}:{radius}".encode("ascii")
+    path = INPAINTED_DIR / f"{_asset_name(_source_id(image_path), params, *(p.tobytes() for p in polys))}.jpg"
+    if not path.exists():
+        _write_atomic(path, _inpaint_jpeg(image_path, contours, method, dilate, radius))
+    return path
+
+
+def _inpaint_jpeg(
+    image_path: str,
+    contours: List[List[Tuple[int, int]]],
+    method: str,
+    dilate: int,
+    radius: int,
+) -> np.ndarray:
+    """移除轮廓区域并填充背景，返回 JPEG 编码缓冲。"""
+
+    if not image_path:
+        raise ValueError("image_path is required")
+    if not len(contours) or all(len(c) < 3 for c in contours):
         raise ValueError("contours must contain at least one polygon with 3+ points")
 
-    img = cv2.imread(image_path, cv2.IMREAD_COLOR)
+    img = _load_image(image_path, cv2.IMREAD_COLOR)
     if img is None:
         raise FileNotFoundError(f"image not found: {image_path}")
 
-    h, w = img.shape[:2]
-    mask = np.zeros((h, w), dtype=np.uint8)
-
-    for poly in contours:
-        if not poly or len(poly) < 3:
-            continue
-        pts = np.array(poly, dtype=np.int32).reshape((-1, 1, 2))
-        cv2.fillPoly(mask, [pts], 255)
+    mask = _polygons_mask(img.shape[:2], _as_polygons(contours))
 
     if dilate and dilate > 0:
-        k = cv2.getStructuringElement(cv2.MORPH_RECT, (max(1, dilate), max(1, dilate)))
-        mask = cv2.dilate(mask, k)
+        mask = _dilate(mask, _rect_kernel(max(1, dilate)))
 
     clean = _smart_fill(img, mask, method, radius)
 
-    ok, buf = cv2.imencode(".png", clean)
+    ok, buf = cv2.imencode(".jpg", clean, _BACKGROUND_JPEG_PARAMS)
     if not ok:
-        raise RuntimeError("encode png failed")
-    b64 = base64.b64encode(buf.tobytes()).decode("ascii")
-    return f"data:image/png;base64,{b64}"
\ No newline at end of file
+        raise RuntimeError("encode jpeg failed")
+    return buf
\ No newline at end of file
@@ -2,140 +2,489 @@
 Segment Anything 分割服务（最小可用）
 ---------------------------------
 功能：
-- 在应用启动时加载 SAM 模型（CPU），并暴露预测函数：根据点击点坐标生成掩码；
-- 将掩码通过 `mask_utils.extract_contour` 转换为轮廓坐标数组。
+- 在应用启动时加载 SAM 模型（有 CUDA 时放到 GPU，推理使用 FP16 autocast），并暴露预测函数：根据点击点坐标生成掩码；
+- `SAM_MODEL_TYPE=vit_t` 时加载 MobileSAM（`mobile_sam` 包），图像编码器小一个数量级，预测接口不变；
+- 配置 `SAM_ENCODER_ONNX_PATH` 时图像编码器改走 ONNX Runtime（优先 TensorRT / CUDA），结果直接写入 predictor；
+- `SAM_COMPILE=true` 时以 torch.compile 编译图像编码器与掩码解码器，并在启动时预热；
+- 将掩码通过 `mask_utils.extract_contour` 转换为 `(N, 2)` int32 轮廓坐标数组；
+- 图像 embedding 按图片内容 sha256 持久化到 `backend/cache/embeddings/`（不在公开的 `/uploads` 下），服务重启或重新打开旧图时直接加载，跳过编码器；
+- 最近使用的若干张图片的 embedding 同时保存在内存 LRU 中，多张图片之间来回切换时直接写回 predictor，不读盘也不重新编码；
+- 上传后的预热（`preload_image`）提交到后台线程并立即返回，分割前通过 `wait_preload` 等待未完成的预热；
+- `segment_with_point_batches` 将多组点提示合并为一次解码器调用（多物体选择）；
+- 最长边超过 1024 的图片先缩小再送入 SAM（编码器输入本就是 1024），提示坐标与返回轮廓在原图像素坐标与缩小图之间自动换算；
+- 点选/框选结果按 (图片, 提示) 缓存在 LRU 中，重复的提示（撤销重做、界面重渲染）直接返回上次轮廓，不再调用解码器。
 
 后续扩展：
 - 支持框选、文本提示与多点融合；
-- 支持返回多条轮廓与置信度；
-- 根据设备配置切换到 GPU。
+- 支持返回多条轮廓与置信度。
 """
 
 from __future__ import annotations
 
+import contextlib
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple
+from typing import Any, List, Tuple
 
+import cv2
 import numpy as np
-from PIL import Image
 
 from ..utils.mask_utils import extract_contour
 from ..utils.logger import log
-from ..config.settings import SAM_MODEL_TYPE, SAM_CHECKPOINT_PATH, SAM_DEVICE
+from ..config.settings import EMBEDDING_CACHE_DIR, get_settings
 
 _predictor = None  # SamPredictor 实例（懒加载）
 _current_image_path: str | None = None  # 已设置到 predictor 的图片路径（用于避免重复 set_image）
+# 当前图片送入 SAM 前的缩放比例（≤1）：提示坐标乘以该比例，轮廓坐标除以该比例还原到原图像素
+_current_scale: float = 1.0
+# 送入 SAM 的图片最长边上限：编码器输入本就是 1024，更大的图只会让缩放、掩码上采样与轮廓提取更慢
+_MAX_INPUT_SIDE = 1024
+# 内存中的 embedding LRU：图片路径 -> (features, original_size, input_size, scale)
+_EMBEDDING_LRU_SIZE = 8
+_embedding_lru: OrderedDict[str, Tuple[Any, Tuple[int, int], Tuple[int, int], float]] = OrderedDict()
+# predictor 持有"当前图片"状态；上传预热在线程池中执行，设置图片与预测需串行
+_predictor_lock = threading.Lock()
+# 上传后的 embedding 预热在单独的后台线程串行执行；记录进行中的预热，分割请求可等待其完成
+_preload_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sam-preload")
+_pending_preloads: dict[str, Future[int]] = {}
+# 批量分割时并行提取各掩码的轮廓
+_contour_executor = ThreadPoolExecutor(max_workers=min(4, os.cpu_count() or 1), thread_name_prefix="sam-contour")
+_use_autocast = False  # 模型在 CUDA 上时启用 FP16 autocast
+_encoder_session = None  # ONNX Runtime 图像编码器会话（配置 SAM_ENCODER_ONNX_PATH 时）
+_ORT_PROVIDERS = ("TensorrtExecutionProvider", "CUDAExecutionProvider", "CPUExecutionProvider")
+# 提示 → 轮廓的 LRU：键为 (图片路径, "points", 点元组, multi) 或 (图片路径, "box", 框)；值为只读轮廓数组
+_PREDICT_CACHE_SIZE = 128
+_predict_cache: OrderedDict[tuple, np.ndarray] = OrderedDict()
+_predict_cache_lock = threading.Lock()
+# 无提示或无掩码时返回的空轮廓（只读，可安全共享）
+_EMPTY_CONTOUR = np.empty((0, 2), dtype=np.int32)
+_EMPTY_CONTOUR.flags.writeable = False
+
+
+def _resolve_device(configured: str) -> str:
+    """`SAM_DEVICE=auto` 时有可用 CUDA 则用 GPU，否则 CPU；显式配置原样返回。"""
+    if configured != "auto":
+        return configured
+    import torch
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def _inference():
+    """SAM 推理上下文：关闭 autograd 记录；GPU 上额外启用 FP16 autocast（走 Tensor Core）。"""
+    import torch
+    stack = contextlib.ExitStack()
+    stack.enter_context(torch.inference_mode())
+    if _use_autocast:
+        stack.enter_context(torch.autocast(device_type="cuda", dtype=torch.float16))
+    return stack
 
 
 def init_sam() -> None:
-    """加载 SAM 模型到内存。默认使用 CPU。"""
-    global _predictor
+    """加载 SAM 模型到内存。`SAM_DEVICE=auto`（默认）时有 CUDA 则使用 GPU。"""
+    global _predictor, _use_autocast
+    settings = get_settings()
     try:
-        from segment_anything import sam_model_registry, SamPredictor
+        if settings.sam_model_type == "vit_t":
+            # MobileSAM：蒸馏的轻量图像编码器，提示编码器/掩码解码器与 SAM 相同，SamPredictor 接口一致
+            from mobile_sam import sam_model_registry, SamPredictor
+        else:
+            from segment_anything import sam_model_registry, SamPredictor
     except Exception as e:
-        log.error(f"segment-anything 未安装或导入失败: {e}")
+        pkg = "mobile_sam" if settings.sam_model_type == "vit_t" else "segment-anything"
+        log.error(f"{pkg} 未安装或导入失败: {e}")
         _predictor = None
         return
 
-    ckpt = Path(SAM_CHECKPOINT_PATH)
+    ckpt = Path(settings.sam_checkpoint_path)
     if not ckpt.exists():
         log.error(f"SAM 权重文件不存在: {ckpt}")
         _predictor = None
         return
 
-    sam = sam_model_registry[SAM_MODEL_TYPE](checkpoint=str(ckpt))
-    device = SAM_DEVICE  # 可按需切换 "cuda"
+    sam = sam_model_registry[settings.sam_model_type](checkpoint=str(ckpt))
+    device = _resolve_device(settings.sam_device)
     sam.to(device)
+    sam.eval()
+    # 权重保持 FP32，由 autocast 在卷积/矩阵乘上降为 FP16：SamPredictor 的预处理与后处理仍按 FP32 运行
+    _use_autocast = device.startswith("cuda")
+    if _use_autocast:
+        import torch
+        torch.backends.cudnn.benchmark = True  # 输入尺寸固定为 1024，首次选定的卷积算法可一直复用
     _predictor = SamPredictor(sam)
-    log.info(f"SAM 模型已加载: type={SAM_MODEL_TYPE}, device={device}, ckpt={ckpt}")
+    _init_encoder_session(settings.sam_encoder_onnx_path)
+    if settings.sam_compile:
+        _compile_model(sam, device)
+    log.info(f"SAM 模型已加载: type={settings.sam_model_type}, device={device}, ckpt={ckpt}")
+
+
+def _compile_model(sam: Any, device: str) -> None:
+    """用 torch.compile 编译图像编码器与掩码解码器，并用空白图做一次预热，把编译耗时留在启动阶段。
+
+    GPU 上使用 `reduce-overhead`（CUDA Graphs 减少 kernel 启动开销）；已使用 ONNX 编码器时只编译解码器。
+    编译或预热失败时恢复为未编译的模块。
+    """
+    import torch
+    mode = "reduce-overhead" if device.startswith("cuda") else "default"
+    originals = (sam.image_encoder, sam.mask_decoder)
+    try:
+        if _encoder_session is None:
+            sam.image_encoder = torch.compile(sam.image_encoder, mode=mode)
+        sam.mask_decoder = torch.compile(sam.mask_decoder, mode=mode)
+        size = _predictor.transform.target_length
+        t0 = time.perf_counter()
+        with _inference():
+            if _encoder_session is not None:
+                _set_image_onnx(np.zeros((size, size, 3), dtype=np.uint8))
+            else:
+                _predictor.set_image(np.zeros((size, size, 3), dtype=np.uint8))
+            _predictor.predict(point_coords=np.array([[size // 2, size // 2]]), point_labels=np.array([1]), multimask_output=False)
+        _predictor.reset_image()
+        log.info(f"SAM torch.compile 预热完成: mode={mode}, {int((time.perf_counter() - t0) * 1000)} ms")
+    except Exception as e:
+        sam.image_encoder, sam.mask_decoder = originals
+        _predictor.reset_image()
+        log.error(f"SAM torch.compile 失败，使用未编译模型: {e}")
+
 
+def _init_encoder_session(onnx_path: str) -> None:
+    """加载 ONNX 图像编码器；未配置、依赖缺失或加载失败时保持 PyTorch 编码器。"""
+    global _encoder_session
+    _encoder_session = None
+    if not onnx_path:
+        return
+    try:
+        import onnxruntime as ort
+    except Exception as e:
+        log.error(f"onnxruntime 未安装，使用 PyTorch 图像编码器: {e}")
+        return
+    available = set(ort.get_available_providers())
+    providers = [p for p in _ORT_PROVIDERS if p in available]
+    try:
+        _encoder_session = ort.InferenceSession(onnx_path, providers=providers)
+    except Exception as e:
+        log.error(f"加载 ONNX 图像编码器失败，使用 PyTorch 图像编码器: {onnx_path}, {e}")
+        return
+    log.info(f"SAM 图像编码器使用 ONNX Runtime: {onnx_path}, providers={_encoder_session.get_providers()}")
 
-def _ensure_image(image_path: str) -> int:
+
+def _set_image_onnx(img: np.ndarray) -> None:
+    """用 ONNX 编码器计算 embedding 并写入 predictor（预处理与 SamPredictor.set_image 相同）。"""
+    import torch
+    input_image = _predictor.transform.apply_image(img)
+    input_torch = torch.as_tensor(input_image, device=_predictor.device).permute(2, 0, 1).contiguous()[None]
+    # 归一化并填充到 1024×1024
+    model_input = _predictor.model.preprocess(input_torch).float().cpu().numpy()
+    (features,) = _encoder_session.run(None, {_encoder_session.get_inputs()[0].name: model_input})
+    _restore_embedding(
+        torch.from_numpy(features).to(_predictor.device),
+        img.shape[:2],
+        tuple(input_torch.shape[-2:]),
+    )
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _embedding_file(cache_key: str) -> Path:
+    # 不同模型类型的 embedding 不通用，文件名带上模型类型
+    return EMBEDDING_CACHE_DIR / f"{get_settings().sam_model_type}_{cache_key}.npz"
+
+
+def _restore_embedding(features: Any, original_size: Tuple[int, int], input_size: Tuple[int, int]) -> None:
+    """将 embedding 状态写回 predictor（与 SamPredictor.set_torch_image 设置的状态保持一致）。"""
+    _predictor.reset_image()
+    _predictor.features = features
+    _predictor.original_size = original_size
+    _predictor.input_size = input_size
+    _predictor.is_image_set = True
+
+
+def _remember_embedding(image_path: str) -> None:
+    """把 predictor 当前的 embedding 放入内存 LRU，超出容量时淘汰最久未用的图片。"""
+    _embedding_lru[image_path] = (_predictor.features, _predictor.original_size, _predictor.input_size, _current_scale)
+    _embedding_lru.move_to_end(image_path)
+    while len(_embedding_lru) > _EMBEDDING_LRU_SIZE:
+        _embedding_lru.popitem(last=False)
+
+
+def _load_embedding(cache_key: str) -> bool:
+    """从磁盘缓存恢复 predictor 的 embedding 状态（含缩放比例），命中返回 True。"""
+    global _current_scale
+    path = _embedding_file(cache_key)
+    if not path.exists():
+        return False
+    try:
+        import torch
+        with np.load(path) as data:
+            # GPU 上保存的是 FP16 特征：CPU 推理不走 autocast，需还原为 FP32
+            features = torch.from_numpy(data["features"]).to(_predictor.device)
+            if not _use_autocast:
+                features = features.float()
+            original_size = tuple(int(v) for v in data["original_size"])
+            input_size = tuple(int(v) for v in data["input_size"])
+            # 早期缓存文件没有 scale：当时按原图尺寸编码，比例为 1
+            scale = float(data["scale"]) if "scale" in data.files else 1.0
+    except Exception as e:
+        log.error(f"读取 embedding 缓存失败（将重新计算）: {path}, {e}")
+        return False
+    _restore_embedding(features, original_size, input_size)
+    _current_scale = scale
+    return True
+
+
+def _save_embedding(cache_key: str) -> None:
+    """将当前 predictor 的 embedding 写入磁盘缓存（先写临时文件再原子替换）。"""
+    path = _embedding_file(cache_key)
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with tmp.open("wb") as f:
+            np.savez(
+                f,
+                features=_predictor.features.detach().cpu().numpy(),
+                original_size=np.array(_predictor.original_size),
+                input_size=np.array(_predictor.input_size),
+                scale=np.array(_current_scale),
+            )
+        os.replace(tmp, path)
+    except Exception as e:
+        log.error(f"写入 embedding 缓存失败: {path}, {e}")
+        tmp.unlink(missing_ok=True)
+
+
+def _ensure_image(image_path: str, cache_key: str | None = None) -> int:
     """确保 predictor 已设置为该图片，并返回 embedding 耗时（毫秒）。
 
     - 若当前图片已在 predictor 中，则返回 0；
-    - 若需重新设置图片，则计算 `set_image` 的耗时并返回。
+    - 若内存 LRU 中有该图片的 embedding，则写回 predictor 并返回 0；
+    - 若磁盘缓存中已有该图片内容（sha256 = `cache_key`，未传入时现算）的 embedding，则直接加载并返回 0；
+    - 否则计算 `set_image` 的耗时并返回，同时写入磁盘缓存；最长边超过 `_MAX_INPUT_SIDE` 的图片先缩小再编码。
 
     注意：SamPredictor 在调用一次 set_image 后，后续的 predict 会复用 embedding；
     因此对同一张图片的多次分割，不需要重复 set_image（可显著减少耗时）。
     """
-    global _current_image_path
+    global _current_image_path, _current_scale
     if _predictor is None:
         raise RuntimeError("SAM 模型未加载，请检查权重路径与依赖安装")
     if _current_image_path == image_path:
         return 0
-    import time
+    cached = _embedding_lru.get(image_path)
+    if cached is not None:
+        *state, _current_scale = cached
+        _restore_embedding(*state)
+        _embedding_lru.move_to_end(image_path)
+        _current_image_path = image_path
+        return 0
+    key = cache_key or _file_sha256(image_path)
     t0 = time.perf_counter()
-    img = np.array(Image.open(image_path).convert("RGB"))
-    _predictor.set_image(img)
+    if _load_embedding(key):
+        _current_image_path = image_path
+        _remember_embedding(image_path)
+        log.debug(f"embedding cache hit in {int((time.perf_counter() - t0) * 1000)} ms: {image_path}")
+        return 0
+    # cv2 直接解码为 numpy 数组（无 PIL 缓冲再拷贝一次），并与 opencv_service 裁剪精灵时的解码（含 EXIF 方向）保持一致
+    img = cv2.imread(image_path, cv2.IMREAD_COLOR)
+    if img is None:
+        raise FileNotFoundError(f"image not found or unreadable: {image_path}")
+    img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    h, w = img.shape[:2]
+    scale = min(1.0, _MAX_INPUT_SIDE / max(h, w))
+    if scale < 1.0:
+        img = cv2.resize(img, (max(1, round(w * scale)), max(1, round(h * scale))), interpolation=cv2.INTER_AREA)
+    with _inference():
+        if _encoder_session is not None:
+            _set_image_onnx(img)
+        else:
+            _predictor.set_image(img)
+    _forget_predictions(image_path)
     _current_image_path = image_path
+    _current_scale = scale
+    _remember_embedding(image_path)
     ms = int((time.perf_counter() - t0) * 1000)
     log.debug(f"set_image done in {ms} ms: {image_path}")
+    _save_embedding(key)
     return ms
 
 
-def segment_with_points(image_path: str, points: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+def _cached_prediction(key: tuple) -> np.ndarray | None:
+    with _predict_cache_lock:
+        contour = _predict_cache.get(key)
+        if contour is not None:
+            _predict_cache.move_to_end(key)
+        return contour
+
+
+def _remember_prediction(key: tuple, contour: np.ndarray) -> np.ndarray:
+    contour.flags.writeable = False  # 缓存结果会被多次返回，禁止调用方原地修改
+    with _predict_cache_lock:
+        _predict_cache[key] = contour
+        _predict_cache.move_to_end(key)
+        while len(_predict_cache) > _PREDICT_CACHE_SIZE:
+            _predict_cache.popitem(last=False)
+    return contour
+
+
+def _forget_predictions(image_path: str) -> None:
+    """图片重新编码 embedding 时，丢弃该图片的全部缓存预测。"""
+    with _predict_cache_lock:
+        for key in [k for k in _predict_cache if k[0] == image_path]:
+            del _predict_cache[key]
+
+
+def _to_original(contour: np.ndarray, scale: float) -> np.ndarray:
+    """将缩小图上的轮廓坐标还原到原图像素坐标。"""
+    if scale == 1.0 or not len(contour):
+        return contour
+    return np.rint(contour / scale).astype(np.int32)
+
+
+def segment_with_points(image_path: str, points: List[Tuple[int, int]], multi: bool = False) -> np.ndarray:
     """根据点击点坐标生成掩码并返回轮廓坐标。
 
     - image_path: 服务器本地图片路径
     - points: [(x, y), ...] 像素坐标
+    - multi: 是否让解码器输出 3 个候选掩码再取得分最高者；默认只输出单掩码（解码计算量约为 1/3）
     """
-    _ensure_image(image_path)
-
     if not points:
         # 无点时返回空
-        return []
+        return _EMPTY_CONTOUR
+    key = (image_path, "points", tuple((int(x), int(y)) for x, y in points), multi)
+    contour = _cached_prediction(key)
+    if contour is not None:
+        log.debug(f"segment(points) cache hit: {image_path}")
+        return contour
 
-    pts = np.array(points)
     labels = np.ones((len(points),), dtype=np.int64)  # 所有点作为前景提示
-    # 返回 (N, H, W) 掩码；此处取第一个得分最高的掩码
-    import time
-    t1 = time.perf_counter()
-    masks, scores, _ = _predictor.predict(point_coords=pts, point_labels=labels, multimask_output=True)
+    # 返回 (N, H, W) 掩码；此处取得分最高的掩码（单掩码时即第一个）
+    wait_preload(image_path)
+    with _predictor_lock:
+        _ensure_image(image_path)
+        scale = _current_scale
+        pts = np.asarray(points, dtype=np.float64) * scale
+        t1 = time.perf_counter()
+        with _inference():
+            masks, scores, _ = _predictor.predict(point_coords=pts, point_labels=labels, multimask_output=multi)
     if masks is None or len(masks) == 0:
-        return []
+        return _EMPTY_CONTOUR
     best_idx = int(np.argmax(scores))
     mask = masks[best_idx]
     t2 = time.perf_counter()
-    contour = extract_contour(mask.astype(np.uint8))
+    contour = _to_original(extract_contour(mask), scale)
     log.info(f"segment(points) time: predict={int((t2-t1)*1000)}ms, contour={int((time.perf_counter()-t2)*1000)}ms, points={len(contour)}")
-    return contour
+    return _remember_prediction(key, contour)
+
+
+def segment_with_point_batches(image_path: str, batches: List[List[Tuple[int, int]]]) -> List[np.ndarray]:
+    """一次解码器调用处理多组点提示（每组对应一个物体），返回与 `batches` 等长的轮廓列表。
+
+    各组点数不同时以标签 -1（SAM 的"非点"填充）补齐为 `(N, K, 2)`，通过 `predict_torch` 批量预测单掩码；
+    随后在线程池中并行提取轮廓（OpenCV 调用释放 GIL）。空组对应空轮廓。
+    """
+    results: List[np.ndarray] = [_EMPTY_CONTOUR] * len(batches)
+    valid = [i for i, b in enumerate(batches) if b]
+    if not valid:
+        return results
+
+    k = max(len(batches[i]) for i in valid)
+    coords = np.zeros((len(valid), k, 2), dtype=np.float32)
+    labels = np.full((len(valid), k), -1, dtype=np.int64)
+    for row, i in enumerate(valid):
+        pts = np.asarray(batches[i], dtype=np.float32)
+        coords[row, :len(pts)] = pts
+        labels[row, :len(pts)] = 1
+
+    import torch
+    wait_preload(image_path)
+    with _predictor_lock:
+        _ensure_image(image_path)
+        scale = _current_scale
+        t1 = time.perf_counter()
+        coords_torch = torch.as_tensor(
+            _predictor.transform.apply_coords(coords * scale, _predictor.original_size), device=_predictor.device
+        )
+        labels_torch = torch.as_tensor(labels, device=_predictor.device)
+        with _inference():
+            masks, _, _ = _predictor.predict_torch(
+                point_coords=coords_torch, point_labels=labels_torch, multimask_output=False
+            )
+        masks_np = masks[:, 0].cpu().numpy()
+    t2 = time.perf_counter()
+    for i, contour in zip(valid, _contour_executor.map(extract_contour, masks_np)):
+        results[i] = _to_original(contour, scale)
+    log.info(f"segment(point batches) time: predict={int((t2-t1)*1000)}ms, contour={int((time.perf_counter()-t2)*1000)}ms, prompts={len(valid)}")
+    return results
 
 
-def segment_with_box(image_path: str, box: Tuple[int, int, int, int]) -> List[Tuple[int, int]]:
+def segment_with_box(image_path: str, box: Tuple[int, int, int, int]) -> np.ndarray:
     """根据框选提示生成掩码并返回轮廓坐标。
 
     - box: [x1, y1, x2, y2] 像素坐标（左上到右下）。
     """
-    _ensure_image(image_path)
-
-    x1, y1, x2, y2 = box
+    key = (image_path, "box", tuple(int(v) for v in box))
+    contour = _cached_prediction(key)
+    if contour is not None:
+        log.debug(f"segment(box) cache hit: {image_path}")
+        return contour
     # SAM 支持 box 提示
-    import time
-    t1 = time.perf_counter()
-    # 对框选，关闭 multimask_output 以减少计算量（返回单掩码）
-    masks, scores, _ = _predictor.predict(box=np.array([x1, y1, x2, y2]), multimask_output=False)
+    wait_preload(image_path)
+    with _predictor_lock:
+        _ensure_image(image_path)
+        scale = _current_scale
+        t1 = time.perf_counter()
+        # 对框选，关闭 multimask_output 以减少计算量（返回单掩码）
+        with _inference():
+            masks, scores, _ = _predictor.predict(box=np.asarray(box, dtype=np.float64) * scale, multimask_output=False)
     if masks is None or len(masks) == 0:
-        return []
+        return _EMPTY_CONTOUR
     best_idx = int(np.argmax(scores))
     mask = masks[best_idx]
     t2 = time.perf_counter()
-    contour = extract_contour(mask.astype(np.uint8))
+    contour = _to_original(extract_contour(mask), scale)
     log.info(f"segment(box) time: predict={int((t2-t1)*1000)}ms, contour={int((time.perf_counter()-t2)*1000)}ms, points={len(contour)}")
-    return contour
+    return _remember_prediction(key, contour)
 
 
-def preload_image(image_path: str) -> int:
-    """对上传图片进行一次 embedding 预热，并返回耗时（毫秒）。
-
-    该函数供路由在图片上传后调用，从而使用户在第一次点选/框选时无需再等待 embedding 计算。
-    """
+def _preload(image_path: str, cache_key: str | None) -> int:
     try:
-        ms = _ensure_image(image_path)
+        with _predictor_lock:
+            ms = _ensure_image(image_path, cache_key)
         # 统一日志（便于前后端排查性能）
         log.info(f"preload_image: image={image_path}, embed_ms={ms}")
         return ms
     except Exception as e:
         # 不中断上传流程；记录错误供排查
         log.error(f"preload_image failed: {e}")
-        return -1
\ No newline at end of file
+        return -1
+
+
+def preload_image(image_path: str, cache_key: str | None = None) -> Future[int]:
+    """提交一次 embedding 预热到后台线程，立即返回 Future（结果为耗时毫秒，失败为 -1，不抛异常）。
+
+    该函数供路由在图片上传后调用：上传响应无需等待编码器，预热与网络往返、前端渲染重叠进行，
+    用户第一次点选/框选时通常已完成。`cache_key` 为图片内容 sha256（上传时已算出可直接传入）；命中缓存时结果为 0。
+    """
+    future = _preload_executor.submit(_preload, image_path, cache_key)
+    _pending_preloads[image_path] = future
+
+    def _forget(f: Future[int]) -> None:
+        if _pending_preloads.get(image_path) is f:
+            del _pending_preloads[image_path]
+
+    future.add_done_callback(_forget)
+    return future
+
+
+def wait_preload(image_path: str) -> None:
+    """若该图片的预热仍在进行，等待其完成（分割前调用，避免与预热重复计算 embedding）。"""
+    future = _pending_preloads.get(image_path)
+    if future is not None:
+        future.result()
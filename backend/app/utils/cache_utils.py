@@ -0,0 +1,55 @@
+"""
+进程内 TTL 缓存
+---------------------------------
+功能：
+- 提供 `TTLCache`：带过期时间与容量上限的简单键值缓存，用于缓存读多写少的接口结果（如广场列表）。
+
+使用说明：
+- 写操作（发布、下架、点赞等）完成后调用 `delete()` / `delete_prefix()` / `clear()` 失效缓存；
+- 每个 worker 进程各自持有一份缓存，`ttl` 决定多进程部署下的最大数据延迟；
+- 未配置 Redis 时，`services.cache_service` 以它作为本地缓存后端。
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """带过期时间的 LRU 缓存（非线程安全，供单个事件循环内使用）。"""
+
+    def __init__(self, maxsize: int = 128, ttl: float = 30.0) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Any | None:
+        """命中且未过期时返回缓存值，否则返回 None。"""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None) -> None:
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def delete_prefix(self, prefix: str) -> None:
+        """删除所有以 `prefix` 开头的字符串键。"""
+        for key in [k for k in self._data if isinstance(k, str) and k.startswith(prefix)]:
+            del self._data[key]
+
+    def clear(self) -> None:
+        self._data.clear()
@@ -3,32 +3,49 @@
 ---------------------------------
 功能：
 - 保存前端上传的文件到 `backend/uploads/<category>/` 目录。
-- 返回保存后的绝对路径，供后续路由/服务使用。
+- 以 1MB 分块流式写盘（在线程中执行，不阻塞事件循环，也不把整张图片读入内存），返回保存后的绝对路径；
+- `save_upload_file_hashed` 额外返回文件内容的 sha256，作为 SAM embedding 磁盘缓存的键。
+- `upload_url` 将 `uploads/` 下的文件路径转换为静态路由 URL（`/uploads/...`）。
 
 后续扩展：
 - 可增加子目录（按日期/用户ID）与存储后清理策略；
 - 可接入对象存储（如 S3、OSS），在此处替换落盘逻辑即可。
 """
 
+import asyncio
+import hashlib
 from pathlib import Path
 from uuid import uuid4
 from typing import Literal
 
 from fastapi import UploadFile
 
-from ..config.settings import PHYSICS_UPLOAD_DIR, MATH_UPLOAD_DIR
+from ..config.settings import UPLOAD_DIR, PHYSICS_UPLOAD_DIR, MATH_UPLOAD_DIR
 
 
 def _target_dir(category: Literal["physics", "math"]) -> Path:
     return PHYSICS_UPLOAD_DIR if category == "physics" else MATH_UPLOAD_DIR
 
 
-def save_upload_file(category: Literal["physics", "math"], file: UploadFile) -> Path:
+_CHUNK_SIZE = 1 << 20
+
+
+async def save_upload_file(category: Literal["physics", "math"], file: UploadFile) -> Path:
     """保存上传文件到对应目录，返回保存后的绝对路径。
 
     命名策略：`<uuid>_<原文件名>`，避免重名覆盖。
     """
 
+    return (await save_upload_file_hashed(category, file))[0]
+
+
+async def save_upload_file_hashed(category: Literal["physics", "math"], file: UploadFile) -> tuple[Path, str]:
+    """保存上传文件并在写入的同时计算内容 sha256，返回 `(绝对路径, 十六进制摘要)`。"""
+
+    return await asyncio.to_thread(_write_upload, category, file)
+
+
+def _write_upload(category: Literal["physics", "math"], file: UploadFile) -> tuple[Path, str]:
     target = _target_dir(category)
     target.mkdir(parents=True, exist_ok=True)
 
@@ -36,8 +53,17 @@ def save_upload_file(category: Literal["physics", "math"], file: UploadFile) ->
     safe_name = f"{uuid4().hex}_{original_name}"
     save_path = target / safe_name
 
+    digest = hashlib.sha256()
+    file.file.seek(0)
     with save_path.open("wb") as out:
-        content = file.file.read()
-        out.write(content)
+        while chunk := file.file.read(_CHUNK_SIZE):
+            digest.update(chunk)
+            out.write(chunk)
+
+    return save_path.resolve(), digest.hexdigest()
+
+
+def upload_url(path: Path) -> str:
+    """`uploads/` 目录下文件对应的站内 URL（由 main.py 挂载的 `/uploads` 静态路由提供）。"""
 
-    return save_path.resolve()
\ No newline at end of file
+    return f"/uploads/{path.relative_to(UPLOAD_DIR).as_posix()}"
@@ -2,44 +2,50 @@
 掩码到轮廓坐标转换工具
 ---------------------------------
 功能：
-- 提供 `extract_contour(mask)` 方法，将二值掩码转换为轮廓点坐标数组。
-- 使用 OpenCV `findContours` 提取最大轮廓，并返回像素坐标点列表。
+- 提供 `extract_contour(mask)` 方法，将二值掩码转换为 `(N, 2)` int32 轮廓点坐标数组。
+- 使用 OpenCV `findContours` 提取最大轮廓，经 Douglas-Peucker（`approxPolyDP`）简化后返回像素坐标点列表；
+  曲线边缘的点数由数百~数千降到几十~上百，误差约 1 像素以内，`/segment` 响应体随之缩小；
+- 返回连续的 int32 数组而非逐点的 Python 列表，由调用方决定序列化方式（JSON 或原始字节）。
 
 后续扩展：
-- 可返回多条轮廓（按面积排序），或做平滑/采样以减少点数。
+- 可返回多条轮廓（按面积排序）。
 - 若前端需要浮点坐标（归一化），在此处做坐标换算即可。
 """
 
-from typing import List, Tuple
-
 import numpy as np
 import cv2
 
 
-def extract_contour(mask: np.ndarray) -> List[Tuple[int, int]]:
+def extract_contour(mask: np.ndarray, epsilon_ratio: float = 0.002) -> np.ndarray:
     """根据二值掩码提取外部轮廓坐标点数组。
 
     参数说明：
-    - mask: 2D numpy 数组；0 表示背景，非 0 表示前景（物体）。
+    - mask: 2D numpy 数组（bool 或 0/1 整数）；0 表示背景，非 0 表示前景（物体）。
+    - epsilon_ratio: 多边形简化容差占轮廓周长的比例；越大点越少、越粗糙，<= 0 时不简化。
 
     返回：
-    - 点坐标数组：[(x1, y1), (x2, y2), ...]，按照轮廓顺序排列。
+    - `(N, 2)` int32 点坐标数组：[[x1, y1], [x2, y2], ...]，按照轮廓顺序排列；无前景时为 `(0, 2)`。
     """
 
     if mask.ndim != 2:
         raise ValueError("mask must be a 2D array")
 
-    # OpenCV 期望 uint8，前景值为 255
-    mask_uint8 = (mask > 0).astype(np.uint8) * 255
+    # findContours 把任意非 0 像素视为前景，无需再阈值化为 0/255；
+    # bool 掩码（SAM 直接输出）按字节零拷贝视为 0/1 的 uint8，已是连续 uint8 时原样传入
+    if mask.dtype == np.bool_:
+        mask_uint8 = np.ascontiguousarray(mask).view(np.uint8)
+    else:
+        mask_uint8 = np.ascontiguousarray(mask, dtype=np.uint8)
 
     contours, _ = cv2.findContours(mask_uint8, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
     if not contours:
-        return []
+        return np.empty((0, 2), dtype=np.int32)
 
     # 取面积最大的轮廓
     largest = max(contours, key=cv2.contourArea)
+    if epsilon_ratio > 0:
+        largest = cv2.approxPolyDP(largest, epsilon_ratio * cv2.arcLength(largest, True), True)
 
-    # 转为 (x, y) 点列表
-    pts = [(int(p[0][0]), int(p[0][1])) for p in largest]
-    return pts
+    # (N, 1, 2) → (N, 2)；findContours 本身输出 int32，视图即可，无需逐点构造 Python 对象
+    return largest.reshape(-1, 2).astype(np.int32, copy=False)
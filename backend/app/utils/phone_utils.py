@@ -0,0 +1,42 @@
+"""
+手机号工具
+---------------------------------
+功能：
+- `validate_phone_number(phone)`：校验中国大陆手机号格式（正则在模块加载时预编译）；
+- `mask_phone_number(phone)`：手机号脱敏（138****8888），用于接口返回与广场作者名展示。
+
+后续扩展：
+- 若需支持海外号码，可在此增加区号解析与对应的校验规则。
+"""
+
+import re
+
+_PHONE_RE = re.compile(r"^1[3-9]\d{9}$")
+
+
+def validate_phone_number(phone: str) -> bool:
+    """
+    校验中国大陆手机号格式
+    
+    Args:
+        phone: 手机号字符串
+        
+    Returns:
+        是否符合格式
+    """
+    return _PHONE_RE.match(phone) is not None
+
+
+def mask_phone_number(phone: str) -> str:
+    """
+    脱敏手机号：138****8888
+    
+    Args:
+        phone: 原始手机号
+        
+    Returns:
+        脱敏后的手机号
+    """
+    if len(phone) == 11:
+        return f"{phone[:3]}****{phone[7:]}"
+    return phone
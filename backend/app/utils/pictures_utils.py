@@ -3,33 +3,55 @@
 ---------------------------------
 功能：
 - 提供将本地图片读取为 base64 并封装为 data URL 的方法，便于直接传递给支持 `image_url` 的对话模型；
-- 自动根据文件扩展名推断 MIME 类型（jpg/png/webp 等）。
+- 自动根据文件扩展名推断 MIME 类型（jpg/png/webp/gif/bmp）。
 
 使用说明：
 - `image_to_data_url(path)` 返回形如 `data:image/jpeg;base64,<...>` 的字符串；
 - 若无法识别扩展名，会回退到 `application/octet-stream`；
+- 编码结果按 (路径, mtime, 大小) 缓存在一个按总字节数限额的小 LRU 中，同一未改动的图片重复编码时直接复用；
 - 仅做编码与简单校验，不处理图像缩放/压缩；如需对超大图下采样，请在调用前处理。
 """
 
 from __future__ import annotations
 
 import base64
-import mimetypes
+import os
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Tuple
 
 from .logger import log
 
 
+# 上传链路只会出现这几种图片类型，静态表直接查，不再经过 `mimetypes` 的类型映射与结果修正
+_MIME = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".webp": "image/webp",
+    ".gif": "image/gif",
+    ".bmp": "image/bmp",
+}
+
+
+# Windows 下 os.open 默认文本模式，需显式 O_BINARY
+_OPEN_FLAGS = os.O_RDONLY | getattr(os, "O_BINARY", 0)
+
+# data URL 缓存：每条约为原图的 1.33 倍，按条数与总字节数双重限额；单条超过总限额的大图不缓存
+_DATA_URL_CACHE_MAX_ITEMS = 4
+_DATA_URL_CACHE_MAX_BYTES = 16 * 1024 * 1024
+_data_url_cache: OrderedDict[Tuple[str, int, int], str] = OrderedDict()
+_data_url_cache_bytes = 0
+_data_url_cache_lock = threading.Lock()
+
+
 def _guess_mime(path: Path) -> str:
     """根据文件扩展名推断 MIME 类型，默认回退为 `application/octet-stream`。
 
     仅用于构造 data URL 的 `image/*` 前缀；不会影响实际内容。
     """
-    mime, _ = mimetypes.guess_type(str(path))
-    if not mime:
-        return "application/octet-stream"
-    return mime
+    return _MIME.get(path.suffix.lower(), "application/octet-stream")
 
 
 def read_file_bytes(path: str | Path) -> bytes:
@@ -39,33 +61,74 @@ def read_file_bytes(path: str | Path) -> bytes:
     - 返回：bytes；若失败则抛出异常并记录日志。
     """
     p = Path(path)
-    if not p.exists():
-        raise FileNotFoundError(f"file not found: {p}")
     try:
-        return p.read_bytes()
+        # 一次 open + fstat 拿到大小，按确切大小一次读取；不再先 exists() 额外 stat 一次
+        fd = os.open(p, _OPEN_FLAGS)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"file not found: {p}") from None
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size)
+        # 普通文件通常一次读满；短读（如读取期间文件增长）时补读剩余部分
+        if len(data) < size:
+            parts = [data]
+            while chunk := os.read(fd, max(size - len(data), 1 << 16)):
+                parts.append(chunk)
+            data = b"".join(parts)
+        return data
     except Exception as e:
         log.error(f"read_file_bytes failed: {p} -> {e}")
         raise
+    finally:
+        os.close(fd)
+
+
+def _encode(p: Path) -> str:
+    """读取并编码图片为 data URL。"""
+    content = read_file_bytes(p)
+    mime = _guess_mime(p)
+    # 前缀与 base64 写入同一个 bytearray，最后只解码一次，不再生成中间的 base64 字符串与拼接副本
+    buf = bytearray(b"data:")
+    buf += mime.encode("ascii")
+    buf += b";base64,"
+    buf += base64.b64encode(memoryview(content))
+    log.debug(f"image_to_data_url: {p} -> {mime}, bytes={len(content)}")
+    return buf.decode("ascii")
+
+
+def _remember_data_url(key: Tuple[str, int, int], data_url: str) -> None:
+    global _data_url_cache_bytes
+    size = len(data_url)  # 纯 ASCII，字符数即字节数
+    if size > _DATA_URL_CACHE_MAX_BYTES:
+        return
+    with _data_url_cache_lock:
+        if key in _data_url_cache:
+            return
+        _data_url_cache[key] = data_url
+        _data_url_cache_bytes += size
+        while len(_data_url_cache) > _DATA_URL_CACHE_MAX_ITEMS or _data_url_cache_bytes > _DATA_URL_CACHE_MAX_BYTES:
+            _, evicted = _data_url_cache.popitem(last=False)
+            _data_url_cache_bytes -= len(evicted)
 
 
 def image_to_data_url(path: str | Path) -> str:
     """将图片编码为 base64 data URL。
 
     示例返回：`data:image/png;base64,iVBORw0KGgo...`
+    同一图片在会话中被多次发送给模型时，未改动的文件直接复用缓存结果（以 (路径, mtime_ns, 大小) 为键，
+    文件被改写后键随之变化，不会读到旧内容），不再重复读取与编码。
     """
     p = Path(path)
-    content = read_file_bytes(p)
-    b64 = base64.b64encode(content).decode("utf-8")
-    mime = _guess_mime(p)
-    # 常用图片类型的简化修正：若 MIME 不以 image/ 开头但扩展名是常见图片，则修正为 image/jpeg
-    if not mime.startswith("image/"):
-        suffix = p.suffix.lower()
-        if suffix in {".jpg", ".jpeg"}:
-            mime = "image/jpeg"
-        elif suffix in {".png"}:
-            mime = "image/png"
-        elif suffix in {".webp"}:
-            mime = "image/webp"
-    data_url = f"data:{mime};base64,{b64}"
-    log.debug(f"image_to_data_url: {p} -> {mime}, bytes={len(content)}")
+    try:
+        st = p.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"file not found: {p}") from None
+    key = (str(p), st.st_mtime_ns, st.st_size)
+    with _data_url_cache_lock:
+        cached = _data_url_cache.get(key)
+        if cached is not None:
+            _data_url_cache.move_to_end(key)
+            return cached
+    data_url = _encode(p)
+    _remember_data_url(key, data_url)
     return data_url
\ No newline at end of file
@@ -0,0 +1,49 @@
+"""
+SAM 图像编码器 ONNX 导出脚本
+---------------------------------
+功能：
+- 按当前配置（`SAM_MODEL_TYPE` / `SAM_CHECKPOINT_PATH`）加载 SAM，将 `image_encoder` 以固定输入
+  1×3×1024×1024 导出为 ONNX；
+- 导出后设置 `SAM_ENCODER_ONNX_PATH` 指向该文件，`segment_service` 即改用 ONNX Runtime
+  （TensorRT / CUDA / CPU 执行提供程序）计算图像 embedding，提示编码器与掩码解码器仍使用 PyTorch。
+
+使用：
+python backend/export_sam_encoder.py [输出路径，默认 backend/app/checkpoints/sam_<类型>_encoder.onnx]
+"""
+
+import sys
+from pathlib import Path
+
+import torch
+
+from app.config.settings import BACKEND_DIR, get_settings
+
+
+def export(output: Path) -> None:
+    settings = get_settings()
+    if settings.sam_model_type == "vit_t":
+        from mobile_sam import sam_model_registry
+    else:
+        from segment_anything import sam_model_registry
+
+    sam = sam_model_registry[settings.sam_model_type](checkpoint=str(settings.sam_checkpoint_path))
+    sam.eval()
+    size = sam.image_encoder.img_size
+    dummy = torch.randn(1, 3, size, size)
+    print(f"正在导出 {settings.sam_model_type} 图像编码器 -> {output}")
+    with torch.inference_mode():
+        torch.onnx.export(
+            sam.image_encoder,
+            dummy,
+            str(output),
+            input_names=["image"],
+            output_names=["image_embeddings"],
+            opset_version=17,
+            do_constant_folding=True,
+        )
+    print("导出完成")
+
+
+if __name__ == "__main__":
+    default = BACKEND_DIR / "app" / "checkpoints" / f"sam_{get_settings().sam_model_type}_encoder.onnx"
+    export(Path(sys.argv[1]) if len(sys.argv) > 1 else default)
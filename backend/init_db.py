@@ -5,16 +5,25 @@
 - 创建 users 表
 - 创建 animations 表
 - 创建 animation_likes 表
+- 清理重复的点赞记录并校正点赞数（补建唯一索引的前提）
+- 为已存在的表补建模型中新增的索引，并删除已被替代的旧索引
 
 使用：
 python backend/init_db.py
 """
 
 import asyncio
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine
 
 DATABASE_URL = "sqlite+aiosqlite:///./backend/sql_app.db"
 
+# 已被新索引替代、需要从旧库中删除的索引
+OBSOLETE_INDEXES = (
+    "ix_animations_public_likes",  # 由部分索引 ix_animations_plaza_rank 替代
+    "ix_animations_public_created",  # 无查询使用，且会误导优化器放弃 ix_animations_plaza_rank
+)
+
 # 导入 Base 和所有模型（这会自动注册到 Base.metadata）
 from app.models.base import Base
 from app.models.user import User
@@ -25,14 +34,43 @@ async def init_database():
     """初始化数据库表"""
     print("正在初始化数据库...")
     
-    engine = create_async_engine(DATABASE_URL, echo=True)
+    # 关闭 echo：逐条打印 DDL 的日志开销在建表脚本中占大头
+    engine = create_async_engine(DATABASE_URL, echo=False, connect_args={"check_same_thread": False})
     
     async with engine.begin() as conn:
+        # 与应用运行时保持一致的日志模式（WAL 持久化在库文件中），初始化期间的读写可以重叠
+        await conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+        await conn.exec_driver_sql("PRAGMA synchronous=NORMAL")
+
         # 删除所有表（可选，用于重建）
         # await conn.run_sync(Base.metadata.drop_all)
         
         # 创建所有表
         await conn.run_sync(Base.metadata.create_all)
+
+        # 旧库没有 (user_id, animation_id) 唯一索引，可能已存在重复点赞：保留最早一条，
+        # 并按实际记录数重算点赞数，否则下面补建唯一索引会失败
+        dup = await conn.execute(text(
+            "DELETE FROM animation_likes WHERE id NOT IN "
+            "(SELECT MIN(id) FROM animation_likes GROUP BY user_id, animation_id)"
+        ))
+        if dup.rowcount:
+            await conn.execute(text(
+                "UPDATE animations SET like_count = "
+                "(SELECT COUNT(*) FROM animation_likes WHERE animation_likes.animation_id = animations.id)"
+            ))
+            print(f"   已清理重复点赞记录：{dup.rowcount} 条，并重算点赞数")
+
+        # create_all 不会为已存在的表补建索引，这里逐个补齐（已存在则跳过）
+        def _create_missing_indexes(sync_conn):
+            for table in Base.metadata.sorted_tables:
+                for index in table.indexes:
+                    index.create(sync_conn, checkfirst=True)
+
+        await conn.run_sync(_create_missing_indexes)
+
+        for index_name in OBSOLETE_INDEXES:
+            await conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
     
     await engine.dispose()
     
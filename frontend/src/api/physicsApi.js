@@ -12,6 +12,11 @@
  * 本次修改（刚体碰撞参数透传）：
  * - simulate 请求体允许传入 `roles` 与 `parameters_list`，与 elements/contours 索引对齐；
  * - 后端将透传这些参数用于前端物理引擎的刚体初始化。
+ *
+ * `segmentBinary` 以二进制请求分割结果，直接返回 Int32Array 坐标视图（省去逐点 JSON 解析）。
+ *
+ * 精灵图与清理后背景以后端静态资源路径返回（`/uploads/...`）。scene_data / 封面中保存的是该相对路径，
+ * 渲染时才用 `assetUrl` 拼接为完整地址，保存的动画不绑定构建前端时的 API 地址。
  */
 
 import axios from 'axios';
@@ -20,6 +25,12 @@ const baseURL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
 // CPU 上首次分割可能较慢（embedding 计算），提高超时以避免误报
 export const client = axios.create({ baseURL, timeout: 60000 });
 
+// 后端返回的站内静态资源路径（如 `/uploads/physics/sprites/xxx.png`）→ 完整 URL；data URL 等完整地址原样返回
+export function assetUrl(path) {
+  if (!path) return null;
+  return path.startsWith('/') ? `${baseURL}${path}` : path;
+}
+
 export async function health() {
   const res = await client.get('/healthz');
   return res.data;
@@ -50,6 +61,32 @@ export async function segment(payload) {
   }
 }
 
+// 二进制分割：请求体带 `binary: true`，响应为 uint32 点数 N + N 组 int32 (x, y)（小端，与浏览器字节序一致）。
+// 返回 Int32Array 视图 [x0, y0, x1, y1, ...]，不做 JSON 解析；传 `point_batches` 时返回 Int32Array 数组。
+export async function segmentBinary(payload) {
+  const res = await client.post('/physics/segment', { ...payload, binary: true }, { responseType: 'arraybuffer' });
+  const buf = res.data;
+  if (!String(res.headers['content-type'] || '').includes('application/octet-stream')) {
+    // 失败时后端仍返回 JSON（code/message）
+    const body = JSON.parse(new TextDecoder().decode(buf));
+    throw new Error(body?.message || 'segment request failed');
+  }
+  const view = new DataView(buf);
+  const readContour = (offset) => {
+    const n = view.getUint32(offset, true);
+    return [new Int32Array(buf, offset + 4, n * 2), offset + 4 + n * 8];
+  };
+  if (!payload?.point_batches) return readContour(0)[0];
+  const contours = [];
+  let offset = 4;
+  for (let i = view.getUint32(0, true); i > 0; i -= 1) {
+    const [contour, next] = readContour(offset);
+    contours.push(contour);
+    offset = next;
+  }
+  return contours;
+}
+
 export async function simulate(payload) {
   const res = await client.post('/physics/simulate', payload);
   return res.data;
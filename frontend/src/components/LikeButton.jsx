@@ -11,14 +11,15 @@
  *   animationId={6}
  *   initialLikeCount={128}
  *   size="small"  // "small" | "medium"
+ *   initialLiked={true}  // 可选：父组件已批量查询过点赞状态时传入，不再单独请求
  * />
  */
 
 import React, { useState, useEffect } from 'react';
 import useAuthStore from '../store/authStore';
 
-export default function LikeButton({ animationId, initialLikeCount = 0, size = 'medium' }) {
-  const [liked, setLiked] = useState(false);
+export default function LikeButton({ animationId, initialLikeCount = 0, size = 'medium', initialLiked }) {
+  const [liked, setLiked] = useState(Boolean(initialLiked));
   const [likeCount, setLikeCount] = useState(initialLikeCount);
   const [loading, setLoading] = useState(false);
   const token = useAuthStore((state) => state.token);
@@ -31,9 +32,14 @@ export default function LikeButton({ animationId, initialLikeCount = 0, size = '
   };
   const config = sizeConfig[size] || sizeConfig.medium;
 
-  // 查询点赞状态
+  // 父组件批量查询结果更新时同步
   useEffect(() => {
-    if (!isLoggedIn || !token) return;
+    if (initialLiked !== undefined) setLiked(Boolean(initialLiked));
+  }, [initialLiked]);
+
+  // 查询点赞状态（父组件未提供 initialLiked 时）
+  useEffect(() => {
+    if (!isLoggedIn || !token || initialLiked !== undefined) return;
 
     const checkLikeStatus = async () => {
       try {
@@ -55,7 +61,7 @@ export default function LikeButton({ animationId, initialLikeCount = 0, size = '
     };
 
     checkLikeStatus();
-  }, [animationId, token, isLoggedIn]);
+  }, [animationId, token, isLoggedIn, initialLiked]);
 
   // 处理点赞
   const handleLike = async (e) => {
@@ -12,6 +12,7 @@
 
 import React, { useState, useEffect } from 'react';
 import useAuthStore from '../store/authStore';
+import { assetUrl } from '../api/physicsApi.js';
 import ShareLinkModal from './ShareLinkModal.jsx';
 
 export default function MyAnimationsPanel({ onLoadAnimation }) {
@@ -253,7 +254,7 @@ export default function MyAnimationsPanel({ onLoadAnimation }) {
               }}>
                 {anim.thumbnail_url ? (
                   <img 
-                    src={anim.thumbnail_url} 
+                    src={assetUrl(anim.thumbnail_url)} 
                     alt={anim.title}
                     style={{
                       width: '100%',
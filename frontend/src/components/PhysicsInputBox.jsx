@@ -3,7 +3,7 @@
  * ---------------------------------
  * 功能：
  * - 支持点击/拖拽上传图片，上传到后端 `/physics/upload`；
- * - 后端在保存后同步执行：预热 SAM embedding 与豆包多模态分析，并返回 `embed_ms`、`ai_ms`、`elements`；
+ * - 后端在保存后执行豆包多模态分析并在后台预热 SAM embedding，返回 `embed_ms`（预热未完成时为 null）、`ai_ms`、`elements`；
  * - 页面展示识别到的元素名称，引导用户进行框选确认；支持多次选择并为每次选择分配元素标签（滑块/斜面/地面）。
  * - 当豆包调用失败时，后端会返回 `doubao_error`，前端在状态行下展示友好提示；
  * - 用户在上传区域点击或框选，调用 `/physics/segment`，绘制返回轮廓；
@@ -47,7 +47,7 @@
  */
 
 import React, { useEffect, useRef, useState, forwardRef, useImperativeHandle } from 'react';
-import { health as apiHealth, uploadImage, segment, simulate } from '../api/physicsApi.js';
+import { health as apiHealth, uploadImage, segment, simulate, assetUrl } from '../api/physicsApi.js';
 import LoadingSpinner from './LoadingSpinner.jsx';
 import ErrorToast from './ErrorToast.jsx';
 import SaveAnimationModal from './SaveAnimationModal.jsx';
@@ -852,7 +852,7 @@ const PhysicsInputBox = forwardRef(({ animationSource }, ref) => {
         console.log('[PhysicsInputBox] 命中缓存，跳过后端 OpenCV 处理');
         const cachedData = simulationCache.current.data;
         serverObjects = cachedData.objects || [];
-        backgroundClean = cachedData.background_clean_data_url;
+        backgroundClean = cachedData.background_clean_url;
         simId = cachedData.simulation_id;
       } else {
         // 【缓存未命中】调用后端进行图像处理
@@ -860,7 +860,7 @@ const PhysicsInputBox = forwardRef(({ animationSource }, ref) => {
         const resp = await simulate({ image_path: imagePath, elements_simple, contours, roles, parameters_list });
         
         serverObjects = Array.isArray(resp?.data?.objects) ? resp.data.objects : [];
-        backgroundClean = resp?.data?.background_clean_data_url;
+        backgroundClean = resp?.data?.background_clean_url;
         simId = resp?.data?.simulation_id;
 
         // 更新缓存
@@ -880,7 +880,7 @@ const PhysicsInputBox = forwardRef(({ animationSource }, ref) => {
         // 只有当参数缺失时才回退到 serverObjects（后端返回的通常是旧值）。
         parameters: { ...(o?.parameters || {}), ...(parameters_list[idx] || {}) },
         contour: (o?.contour || contours[idx] || []),
-        sprite_data_url: o?.sprite_data_url || null,
+        sprite_data_url: o?.sprite_url, // 站内相对路径（/uploads/...），保存进 scene_data；渲染时再经 assetUrl 解析
         is_concave: is_concave_list[idx] || false,  // 传递凹面体标识给物理引擎
       }));
       // 若后端提供"清理后的背景"，直接替换当前预览图为该背景
@@ -967,7 +967,7 @@ const PhysicsInputBox = forwardRef(({ animationSource }, ref) => {
           <div style={{ position: 'relative', width: '100%', height: '100%' }}>
             <img
               ref={imgRef}
-              src={imagePreview}
+              src={assetUrl(imagePreview)}
               alt="preview"
               style={{
                 position: 'absolute',
@@ -12,16 +12,22 @@
 
 import React, { useState, useEffect } from 'react';
 import LikeButton from './LikeButton.jsx';
+import useAuthStore from '../store/authStore';
+import { assetUrl } from '../api/physicsApi.js';
 
 export default function PlazaPanel({ onLoadAnimation, onPlazaAnimationLoad }) {
   const [animations, setAnimations] = useState([]);
   const [loading, setLoading] = useState(true);
   const [selectedCardId, setSelectedCardId] = useState(null); // 选中的卡片ID
+  const token = useAuthStore((state) => state.token);
+  const isLoggedIn = useAuthStore((state) => state.isLoggedIn);
 
-  // 加载广场动画列表
+  // 加载广场动画列表（已登录时携带 Token，列表项中直接返回 liked 点赞状态）
   const loadPlazaAnimations = async () => {
     try {
-      const response = await fetch('http://localhost:8000/api/plaza/animations');
+      const response = await fetch('http://localhost:8000/api/plaza/animations', {
+        headers: isLoggedIn && token ? { 'Authorization': `Bearer ${token}` } : {}
+      });
       const data = await response.json();
       
       if (data.code === 0) {
@@ -38,7 +44,7 @@ export default function PlazaPanel({ onLoadAnimation, onPlazaAnimationLoad }) {
 
   useEffect(() => {
     loadPlazaAnimations();
-  }, []);
+  }, [token, isLoggedIn]);
 
   // 点击卡片加载动画
   const handleCardClick = async (animationId) => {
@@ -175,7 +181,7 @@ export default function PlazaPanel({ onLoadAnimation, onPlazaAnimationLoad }) {
               }}>
                 {anim.thumbnail_url ? (
                   <img 
-                    src={anim.thumbnail_url} 
+                    src={assetUrl(anim.thumbnail_url)} 
                     alt={anim.title}
                     style={{
                       width: '100%',
@@ -218,6 +224,7 @@ export default function PlazaPanel({ onLoadAnimation, onPlazaAnimationLoad }) {
                   <LikeButton 
                     animationId={anim.id} 
                     initialLikeCount={anim.like_count || 0}
+                    initialLiked={isLoggedIn ? Boolean(anim.liked) : undefined}
                     size="small"
                   />
                   {anim.author_name && (
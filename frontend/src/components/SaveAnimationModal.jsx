@@ -16,6 +16,7 @@
 
 import React, { useState } from 'react';
 import useAuthStore from '../store/authStore';
+import { assetUrl } from '../api/physicsApi.js';
 
 export default function SaveAnimationModal({ isOpen, onClose, sceneData, getSceneData }) {
   // 优先使用 getSceneData 函数（动态获取最新数据），否则用传入的 sceneData
@@ -361,7 +362,7 @@ export default function SaveAnimationModal({ isOpen, onClose, sceneData, getScen
         {getCurrentSceneData()?.imagePreview && (
           <div style={{ marginBottom: 16, textAlign: 'center' }}>
             <img 
-              src={getCurrentSceneData().imagePreview} 
+              src={assetUrl(getCurrentSceneData().imagePreview)} 
               alt="封面预览"
               style={{
                 maxWidth: '100%',
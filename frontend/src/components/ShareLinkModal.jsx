@@ -16,6 +16,9 @@
 import React, { useState, useEffect } from 'react';
 import useAuthStore from '../store/authStore';
 
+// 分享链接的唯一来源：前端按当前站点地址拼接（后端只返回分享码与站内路径，不配置站点地址）
+const buildShareUrl = (shareCode) => `${window.location.origin}/physics/play/${shareCode}`;
+
 export default function ShareLinkModal({ isOpen, onClose, animationId, existingShareCode = null }) {
   const [shareUrl, setShareUrl] = useState('');
   const [loading, setLoading] = useState(false);
@@ -27,10 +30,9 @@ export default function ShareLinkModal({ isOpen, onClose, animationId, existingS
   useEffect(() => {
     if (!isOpen || !animationId) return;
 
-    // 如果已有分享码，直接构建 URL
+    // 如果已有分享码，直接构建 URL（使用当前站点地址，避免部署后仍指向 localhost）
     if (existingShareCode) {
-      const url = `http://localhost:5174/physics/play/${existingShareCode}`;
-      setShareUrl(url);
+      setShareUrl(buildShareUrl(existingShareCode));
       return;
     }
 
@@ -57,7 +59,7 @@ export default function ShareLinkModal({ isOpen, onClose, animationId, existingS
         const data = await response.json();
         
         if (data.code === 0) {
-          setShareUrl(data.data.share_url);
+          setShareUrl(buildShareUrl(data.data.share_code));
         } else {
           alert(`生成失败：${data.message}`);
           onClose();
@@ -13,6 +13,7 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { useParams } from 'react-router-dom';
 import { runSimulation } from '../utils/physicsEngine.js';
+import { assetUrl } from '../api/physicsApi.js';
 import useAuthStore from '../store/authStore';
 
 export default function PlayPage() {
@@ -258,7 +259,7 @@ export default function PlayPage() {
             <>
               <img
                 ref={imgRef}
-                src={animation.scene_data.imagePreview}
+                src={assetUrl(animation.scene_data.imagePreview)}
                 alt="动画场景"
                 style={{
                   position: 'absolute',
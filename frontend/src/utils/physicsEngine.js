@@ -95,7 +95,7 @@
  *   role: 'static' | 'dynamic', // 物体类型：静态（不动）或动态（受重力影响）
  *   contour: [{x, y}, ...],    // 轮廓点数组（原图坐标系）
  *   is_concave: boolean,       // 是否为凹面体（由大模型判断）
- *   sprite_data_url: string,   // Base64 贴图数据（可选）
+ *   sprite_data_url: string,   // 贴图地址：站内相对路径（/uploads/...，渲染时经 assetUrl 拼接）或 data URL（可选）
  *   parameters: {              // 物理参数
  *     mass_kg: number,                    // 质量（千克）
  *     restitution: number,                // 弹性系数 (0-1)
@@ -138,6 +138,7 @@
  */
 
 import Matter from 'matter-js';
+import { assetUrl } from '../api/physicsApi.js';
 
 
 // ╔═══════════════════════════════════════════════════════════════════╗
@@ -579,7 +580,7 @@ export function runSimulation({ container, objects = [], constraints = [], image
         restitution,            // 弹性系数
         render: obj.sprite_data_url
           // 如果有贴图，使用贴图渲染
-          ? { sprite: { texture: obj.sprite_data_url, xScale: sx, yScale: sy } }
+          ? { sprite: { texture: assetUrl(obj.sprite_data_url), xScale: sx, yScale: sy } }
           // 否则使用纯色填充（静态灰色，动态蓝色）
           : { fillStyle: isStatic ? '#94a3b8' : '#60a5fa' },
       });
@@ -1020,7 +1021,7 @@ function createConvexHullBody(processed, obj, isStatic, friction, air, restituti
     frictionAir: air,
     restitution,
     render: obj.sprite_data_url
-      ? { sprite: { texture: obj.sprite_data_url, xScale: sx, yScale: sy } }
+      ? { sprite: { texture: assetUrl(obj.sprite_data_url), xScale: sx, yScale: sy } }
       : { fillStyle: isStatic ? '#94a3b8' : '#60a5fa' },
   });
 